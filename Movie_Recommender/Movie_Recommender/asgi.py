@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Movie_Recommender.settings')
+# urls.py only serves the async views from the single long-lived event loop of an ASGI server
+os.environ['MOVIE_RECOMMENDER_ASGI'] = 'true'
 
 application = get_asgi_application()
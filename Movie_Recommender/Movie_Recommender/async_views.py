@@ -0,0 +1,238 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+
+from . import catalog
+from . import movie_cache
+from . import omdb_client
+from . import snapshots
+from .instrumentation import span
+from .utils import get_enhanced_movie_suggestions_from_mood, get_mood_analysis_and_recommendations_async
+from .views import (
+    CARD_STREAM_DELIMITER_BYTES, MOOD_COMBINED_MODE, MOOD_ENGINE, MOOD_RESULT_COUNT, OMDB_FETCH_DEADLINE,
+    OMDB_FETCH_WORKERS, add_llm_recommendations, format_movie_details, get_movie_hint,
+    get_placeholder_movie_details, movie_details_api_response, movie_list_response, render_movie_card,
+    track_recommended_movies,
+)
+
+# The database tier of the cache and every write run off the event loop
+lookup_title_in_db = sync_to_async(movie_cache.lookup_title)
+lookup_imdb_id_in_db = sync_to_async(movie_cache.lookup_imdb_id)
+store = sync_to_async(movie_cache.store)
+store_not_found = sync_to_async(movie_cache.store_not_found)
+store_alias = sync_to_async(movie_cache.store_alias)
+
+
+async def lookup_title(title, year=None):
+    """
+    movie_cache.lookup_title with memory hits answered on the event loop, so they
+    do not queue behind other requests for the shared sync thread.
+    """
+    data = movie_cache.lookup_title_in_memory(title, year)
+    return data if data is not None else await lookup_title_in_db(title, year)
+
+
+async def lookup_imdb_id(imdb_id):
+    """
+    movie_cache.lookup_imdb_id with memory hits answered on the event loop.
+    """
+    data = movie_cache.lookup_imdb_id_in_memory(imdb_id)
+    return data if data is not None else await lookup_imdb_id_in_db(imdb_id)
+
+
+async def mood_recommendations(request):
+    """
+    Async variant of views.mood_recommendations: the LLM and OMDb calls are awaited
+    instead of holding a worker thread each.
+    """
+    if request.method != 'POST':
+        return HttpResponse('Invalid request method.', status=405)
+
+    mood = request.POST.get('mood', '').strip()
+    if not mood:
+        return HttpResponse('Mood input is required.', status=400)
+
+    try:
+        ai_response = []
+        if MOOD_ENGINE == 'ann':
+            from .mood_index import search_movies_for_mood
+            try:
+                ai_response = search_movies_for_mood(mood, MOOD_RESULT_COUNT)
+            except Exception as e:
+                print(f"Error in mood index retrieval: {e}")
+
+        if len(ai_response) < MOOD_RESULT_COUNT:
+            if MOOD_COMBINED_MODE:
+                llm_response = (await get_mood_analysis_and_recommendations_async(mood))['movies']
+            else:
+                llm_response = await sync_to_async(get_enhanced_movie_suggestions_from_mood, thread_sensitive=False)(mood)
+            ai_response = add_llm_recommendations(ai_response, llm_response)
+
+        if not ai_response:
+            return HttpResponse('No recommendations available for the provided mood.', status=404)
+
+        track_recommended_movies(request, ai_response, mood)
+
+        return await movie_cards_response(request, ai_response)
+
+    except Exception as e:
+        print(f"Error generating recommendations: {e}")
+        return HttpResponse('An error occurred while generating recommendations. Please try again later.', status=500)
+
+
+@span('fetch_movie_details')
+async def fetch_movie_details(movie_name, year=None):
+    """
+    Async views.fetch_movie_details, sharing the same cache tiers.
+    """
+    data = await lookup_title(movie_name, year)
+    if data is movie_cache.NOT_FOUND:
+        return await fetch_movie_details(movie_name) if year else get_placeholder_movie_details(movie_name)
+
+    if data is None:
+        # The catalog index is in memory, so matching runs on the event loop
+        match = catalog.resolve_title(movie_name, year)
+        exact_id = match[0] if match and match[1] >= 1.0 else None
+        if exact_id:
+            data = await lookup_imdb_id(exact_id)
+            if data is not None and data is not movie_cache.NOT_FOUND:
+                await store_alias(movie_name, data, year)
+                return format_movie_details(data, movie_name)
+
+        try:
+            if exact_id and data is None:
+                data = await omdb_client.get_movie_async(imdb_id=exact_id)
+                if movie_cache.is_not_found(data):
+                    movie_cache.store_not_found(imdb_id=exact_id)
+            if data is None or data is movie_cache.NOT_FOUND or movie_cache.is_not_found(data):
+                data = await omdb_client.get_movie_async(title=movie_name, year=year)
+                if match and not exact_id and not year and movie_cache.is_not_found(data):
+                    data = await fetch_catalog_match(match[0]) or data
+        except omdb_client.OMDbUnavailable as e:
+            print(f"OMDb unavailable for {movie_name}: {e}")
+            return get_placeholder_movie_details(movie_name)
+
+        if data.get('Response') == 'True':
+            await store(data, title=movie_name, year=year)
+        elif movie_cache.is_not_found(data):
+            await store_not_found(title=movie_name, year=year)
+            if year:
+                return await fetch_movie_details(movie_name)
+
+    return format_movie_details(data, movie_name)
+
+
+async def fetch_catalog_match(imdb_id):
+    """
+    Async views.fetch_catalog_match.
+    """
+    data = await lookup_imdb_id(imdb_id)
+    if data is None:
+        data = await omdb_client.get_movie_async(imdb_id=imdb_id)
+    if data is movie_cache.NOT_FOUND or data.get('Response') != 'True':
+        return None
+    return data
+
+
+async def iter_movie_details_concurrently(movies):
+    """
+    Yield movie details in input order as they resolve, at most OMDB_FETCH_WORKERS
+    lookups at a time. Failures and lookups past the deadline yield the placeholder.
+    """
+    semaphore = asyncio.Semaphore(OMDB_FETCH_WORKERS)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + OMDB_FETCH_DEADLINE
+    hints = [get_movie_hint(movie) for movie in movies]
+
+    async def fetch(title, year):
+        async with semaphore:
+            return await fetch_movie_details(title, year)
+
+    tasks = [asyncio.create_task(fetch(title, year)) for title, year in hints]
+    try:
+        for (movie, _), task in zip(hints, tasks):
+            try:
+                yield await asyncio.wait_for(task, max(0, deadline - loop.time()))
+            except asyncio.TimeoutError:
+                print(f"Timed out fetching details for {movie}")
+                yield get_placeholder_movie_details(movie)
+            except Exception as e:
+                print(f"Error fetching details for {movie}: {e}")
+                yield get_placeholder_movie_details(movie)
+    finally:
+        # A disconnected client must not leave lookups running
+        for task in tasks:
+            task.cancel()
+
+
+async def stream_enhanced_movie_cards(movies):
+    async for movie_details in iter_movie_details_concurrently(movies):
+        yield render_movie_card(movie_details) + CARD_STREAM_DELIMITER_BYTES
+
+
+async def movie_cards_response(request, movies):
+    """
+    Async views.movie_cards_response.
+    """
+    if request.GET.get('stream') == '1':
+        response = StreamingHttpResponse(stream_enhanced_movie_cards(movies), content_type="text/html")
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    cards = [render_movie_card(movie_details) async for movie_details in iter_movie_details_concurrently(movies)]
+    return HttpResponse(b''.join(cards), content_type="text/html")
+
+
+async def list_response(request, name):
+    """
+    Serve a snapshot as views.movie_list_response does, rendering live without blocking when none exists.
+    """
+    if snapshots.get_snapshot(name) is None:
+        return await movie_cards_response(request, snapshots.get_movie_list(name))
+    return movie_list_response(request, name)
+
+
+async def get_trending_movies(request):
+    try:
+        return await list_response(request, 'trending')
+
+    except Exception as e:
+        print(f"Error fetching trending movies: {e}")
+        return HttpResponse('<p>Error loading trending movies.</p>', status=500)
+
+
+async def get_recent_movies(request):
+    try:
+        return await list_response(request, 'recent')
+
+    except Exception as e:
+        print(f"Error fetching recent movies: {e}")
+        return HttpResponse('<p>Error loading recent movies.</p>', status=500)
+
+
+async def get_movie_details_api(request, imdb_id):
+    """
+    Async views.get_movie_details_api.
+    """
+    try:
+        data = await lookup_imdb_id(imdb_id)
+        if data is movie_cache.NOT_FOUND:
+            return JsonResponse({'error': 'Movie not found'}, status=404)
+
+        if data is None:
+            try:
+                data = await omdb_client.get_movie_async(imdb_id=imdb_id)
+            except omdb_client.OMDbUnavailable as e:
+                print(f"OMDb unavailable for {imdb_id}: {e}")
+                return JsonResponse({'error': 'Movie details are temporarily unavailable'}, status=503)
+
+            if data.get('Response') == 'True':
+                await store(data)
+            elif movie_cache.is_not_found(data):
+                await store_not_found(imdb_id=imdb_id)
+
+        return movie_details_api_response(request, imdb_id, data)
+
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
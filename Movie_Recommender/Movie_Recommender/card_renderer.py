@@ -0,0 +1,106 @@
+import os
+from html import escape
+from string import Formatter
+
+from .movie_cache import LRUCache
+from .instrumentation import span
+from .streaming_links import get_links
+
+CARD_CACHE_MAX_ENTRIES = int(os.getenv('CARD_CACHE_MAX_ENTRIES', '5000'))
+# Fragments only go stale through metadata changes, which change their key
+CARD_CACHE_TTL = int(os.getenv('CARD_CACHE_TTL', str(24 * 3600)))
+PLOT_EXCERPT_LENGTH = 100
+
+CARD_TEMPLATE = '''
+        <div class="enhanced-movie-card" data-imdbid="{imdbID}">
+            <div class="movie-poster-container">
+                <img src="{poster}" alt="{title}" class="enhanced-movie-poster">
+                <div class="movie-overlay">
+                    <div class="movie-rating">⭐ {rating}</div>
+                </div>
+                <div class="movie-actions">
+                    <button class="action-btn like-btn" data-movie="{title}" data-imdb="{imdbID}">❤️</button>
+                    <button class="action-btn watchlist-btn" data-movie="{title}" data-imdb="{imdbID}">📋</button>
+                </div>
+            </div>
+            <div class="enhanced-movie-info">
+                <h3 class="enhanced-movie-title">{title}</h3>
+                <p class="movie-year-genre">{year} • {genre}</p>
+                <p class="movie-runtime">⏱️ {runtime}</p>
+                <p class="movie-plot">{plot}</p>
+                <div class="streaming-links">
+                    {streaming_buttons}
+                </div>
+            </div>
+        </div>
+        '''
+
+LINK_TEMPLATE = '<a href="{url}" target="_blank" class="streaming-link" style="background-color: {color}">{name}</a>'
+
+
+def compile_template(template):
+    """
+    Split a str.format template once into (literal, field) pairs so rendering is a single join.
+    """
+    return [(literal, field) for literal, field, _, _ in Formatter().parse(template)]
+
+
+CARD_PARTS = compile_template(CARD_TEMPLATE)
+LINK_PARTS = compile_template(LINK_TEMPLATE)
+
+
+def render_template(parts, values):
+    return ''.join([literal + values[field] if field else literal for literal, field in parts])
+
+
+fragment_cache = LRUCache(CARD_CACHE_MAX_ENTRIES)
+_stats = {'hits': 0, 'misses': 0}
+
+
+def fragment_key(movie_details):
+    """
+    Cache key for a card: the imdbID plus a fingerprint of the rendered fields,
+    so a metadata change produces a new key instead of a stale fragment.
+    """
+    return f"{movie_details['imdbID']}:{hash(tuple(movie_details.values()))}"
+
+
+@span('render_card')
+def render_card(movie_details):
+    """
+    Render one card to UTF-8 bytes without consulting the cache. Every value is HTML-escaped.
+    """
+    values = {key: escape(str(value)) for key, value in movie_details.items()}
+    plot = movie_details['plot']
+    if len(plot) > PLOT_EXCERPT_LENGTH:
+        values['plot'] = escape(plot[:PLOT_EXCERPT_LENGTH]) + '...'
+    values['streaming_buttons'] = ''.join(
+        render_template(LINK_PARTS, {key: escape(value) for key, value in link.items()})
+        for link in get_links(movie_details['title'], movie_details['imdbID'])
+    )
+    return render_template(CARD_PARTS, values).encode('utf-8')
+
+
+def get_card(movie_details):
+    """
+    Return the rendered card for a movie, from the fragment cache when possible.
+    Placeholder cards (no imdbID) are rendered every time.
+    """
+    if not movie_details['imdbID']:
+        return render_card(movie_details)
+
+    key = fragment_key(movie_details)
+    fragment = fragment_cache.get(key)
+    if fragment is None:
+        _stats['misses'] += 1
+        fragment = render_card(movie_details)
+        fragment_cache.set(key, fragment, CARD_CACHE_TTL)
+    else:
+        _stats['hits'] += 1
+    return fragment
+
+
+def get_card_cache_stats():
+    stats = dict(_stats)
+    stats['entries'] = len(fragment_cache)
+    return stats
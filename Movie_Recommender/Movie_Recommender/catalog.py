@@ -0,0 +1,291 @@
+import os
+import re
+import bisect
+import threading
+import time
+import logging
+from collections import defaultdict
+
+from django.db import DatabaseError, connection
+
+from .models import CatalogTitle
+from .movie_cache import normalize_title
+
+logger = logging.getLogger(__name__)
+
+# Minimum trigram similarity (Dice coefficient) for a fuzzy title match
+CATALOG_MATCH_THRESHOLD = float(os.getenv('CATALOG_MATCH_THRESHOLD', '0.8'))
+# How often a process checks whether another process changed the catalog
+CATALOG_RELOAD_INTERVAL = float(os.getenv('CATALOG_RELOAD_INTERVAL', '60'))
+# Fuzzy matching gathers candidates from this many of the query's rarest trigrams
+CATALOG_CANDIDATE_TRIGRAMS = 6
+# Upper bound on prefix matches ranked for one typeahead query
+CATALOG_PREFIX_SCAN = 2000
+
+LEADING_ARTICLES = ('the ', 'a ', 'an ')
+# Roman numerals up to 39, enough for any sequel or part number
+ROMAN_NUMERAL = re.compile(r'^(x{0,3})(ix|iv|v?i{0,3})$')
+ROMAN_VALUES = {'i': 1, 'v': 5, 'x': 10}
+
+
+def trigrams(key):
+    padded = f'  {key} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def strip_article(key):
+    """
+    Drop a leading 'the', 'a' or 'an' from a normalized title; LLMs often add or omit them.
+    """
+    for article in LEADING_ARTICLES:
+        if key.startswith(article):
+            return key[len(article):]
+    return key
+
+
+def sequel_numbers(key):
+    """
+    Numbers in a normalized title, with roman numerals read as numbers:
+    'rocky ii' and 'rocky 2' both give {2}, 'toy story 4' gives {4}.
+    """
+    numbers = set()
+    for token in key.split():
+        if token.isdigit():
+            numbers.add(int(token))
+        elif ROMAN_NUMERAL.match(token):
+            values = [ROMAN_VALUES[char] for char in token]
+            numbers.add(sum(-value if value < following else value
+                            for value, following in zip(values, values[1:] + [0])))
+    return numbers
+
+
+def parse_year(value):
+    """
+    First four-digit year of an OMDb Year field such as '1999' or '2019–2022'.
+    """
+    match = re.match(r'\d{4}', str(value or ''))
+    return int(match.group()) if match else None
+
+
+def parse_votes(value):
+    try:
+        return int(str(value).replace(',', ''))
+    except ValueError:
+        return 0
+
+
+class TitleIndex:
+    """
+    In-memory title index: a sorted key list for prefix search and a trigram
+    inverted index for fuzzy matching. Titles can be added while serving.
+    """
+
+    def __init__(self):
+        self.movies = []
+        self.positions = {}
+        self.exact = defaultdict(list)
+        self.prefix = []
+        self.postings = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def add(self, imdb_id, title, year=None, votes=0):
+        with self._lock:
+            position = self.positions.get(imdb_id)
+            if position is not None:
+                # Known title: refresh the metadata that does not affect the index
+                _, old_title, _, _, key = self.movies[position]
+                if old_title == title:
+                    self.movies[position] = (imdb_id, title, year, votes, key)
+                    return
+
+            key = normalize_title(title)
+            if not key:
+                return
+            position = len(self.movies)
+            self.movies.append((imdb_id, title, year, votes, key))
+            self.positions[imdb_id] = position
+            match_key = strip_article(key)
+            self.exact[match_key].append(position)
+            bisect.insort(self.prefix, (key, position))
+            if match_key != key:
+                bisect.insort(self.prefix, (match_key, position))
+            for gram in trigrams(match_key):
+                self.postings[gram].append(position)
+
+    def _is_current(self, position):
+        imdb_id = self.movies[position][0]
+        return self.positions.get(imdb_id) == position
+
+    def search(self, query, limit=10):
+        """
+        Titles starting with the query (ignoring a leading article), most voted first.
+        """
+        key = normalize_title(query)
+        if not key:
+            return []
+
+        start = bisect.bisect_left(self.prefix, (key,))
+        matches = set()
+        for prefix_key, position in self.prefix[start:start + CATALOG_PREFIX_SCAN]:
+            if not prefix_key.startswith(key):
+                break
+            if self._is_current(position):
+                matches.add(position)
+
+        ranked = sorted(matches, key=lambda position: -self.movies[position][3])[:limit]
+        return [self._as_result(position) for position in ranked]
+
+    def match(self, title, year=None):
+        """
+        Return (imdb_id, score) of the catalog title closest to `title`, or None.
+        A score of 1.0 means the titles are equal once normalized. A release year,
+        when given, must agree within one year, and fuzzy matches must carry the
+        same sequel numbers, so 'Toy Story 4' never matches 'Toy Story 3'.
+        """
+        key = strip_article(normalize_title(title))
+        if not key:
+            return None
+
+        candidates = [position for position in self.exact.get(key, ()) if self._is_current(position)]
+        if candidates:
+            scored = [(1.0, position) for position in candidates]
+        else:
+            grams = trigrams(key)
+            numbers = sequel_numbers(key)
+            rarest = sorted(grams, key=lambda gram: len(self.postings.get(gram, ())))[:CATALOG_CANDIDATE_TRIGRAMS]
+            candidates = {position for gram in rarest for position in self.postings.get(gram, ())}
+            scored = []
+            for position in candidates:
+                if not self._is_current(position):
+                    continue
+                other_key = strip_article(self.movies[position][4])
+                if sequel_numbers(other_key) != numbers:
+                    continue
+                other = trigrams(other_key)
+                scored.append((2 * len(grams & other) / (len(grams) + len(other)), position))
+
+        if year:
+            scored = [(score, position) for score, position in scored
+                      if self.movies[position][2] is None or abs(self.movies[position][2] - int(year)) <= 1]
+        if not scored:
+            return None
+
+        score, position = max(scored, key=lambda item: (item[0], self.movies[item[1]][3]))
+        if score < CATALOG_MATCH_THRESHOLD:
+            return None
+        return self.movies[position][0], score
+
+    def _as_result(self, position):
+        imdb_id, title, year, _, _ = self.movies[position]
+        return {'imdbID': imdb_id, 'Title': title, 'Year': year}
+
+    def __len__(self):
+        return len(self.positions)
+
+
+class CatalogLoader:
+    """
+    Keeps this process's title index in step with the CatalogTitle table. Loads and
+    size checks run on a background thread, so no request waits on a full reload;
+    until the first load finishes, lookups see an empty index.
+    """
+
+    def __init__(self, interval=CATALOG_RELOAD_INTERVAL):
+        self.interval = interval
+        self.index = TitleIndex()
+        self.count = None
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        self._ensure_started()
+        return self.index
+
+    def refresh(self):
+        """
+        Rebuild the index when the table changed size (e.g. after an import in another process).
+        """
+        try:
+            count = CatalogTitle.objects.count()
+            if count != self.count:
+                start = time.monotonic()
+                index = TitleIndex()
+                for imdb_id, title, year, votes in CatalogTitle.objects.values_list('imdb_id', 'title', 'year', 'votes').iterator():
+                    index.add(imdb_id, title, year, votes)
+                self.index = index
+                self.count = count
+                logger.info(f"Loaded {len(index)} catalog titles in {time.monotonic() - start:.2f}s")
+        except DatabaseError as e:
+            logger.warning(f"Could not load movie catalog: {e}")
+
+    def _run(self):
+        while True:
+            self.refresh()
+            # The loader thread keeps no connection open between checks
+            connection.close()
+            time.sleep(self.interval)
+
+    def _ensure_started(self):
+        # A forked worker inherits the thread object but not the thread, so check the pid too
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name='catalog-loader', daemon=True)
+                self._thread.start()
+
+
+loader = CatalogLoader()
+
+
+def get_index():
+    """
+    Return the current title index without blocking on the database.
+    """
+    return loader.get()
+
+
+def record_movie(data):
+    """
+    Add a successful OMDb payload to the catalog.
+    """
+    imdb_id = data.get('imdbID')
+    title = data.get('Title')
+    if not imdb_id or not title:
+        return
+
+    year = parse_year(data.get('Year'))
+    votes = parse_votes(data.get('imdbVotes', 0))
+    try:
+        _, created = CatalogTitle.objects.update_or_create(
+            imdb_id=imdb_id, defaults={'title': title, 'year': year, 'votes': votes}
+        )
+    except DatabaseError as e:
+        logger.warning(f"Movie catalog write failed: {e}")
+        return
+
+    loader.index.add(imdb_id, title, year, votes)
+    if created and loader.count is not None:
+        # Keep the size check from treating our own insert as an outside change
+        loader.count += 1
+
+
+def resolve_title(title, year=None):
+    """
+    (imdbID, score) of the catalog title closest to a possibly misspelled title, or None
+    when nothing is close enough. A score below 1.0 is a fuzzy match.
+    """
+    try:
+        return get_index().match(title, year)
+    except Exception as e:
+        logger.warning(f"Movie catalog lookup failed for {title}: {e}")
+        return None
+
+
+def suggest_titles(query, limit=10):
+    """
+    Typeahead suggestions for a title prefix, served without touching OMDb.
+    """
+    return get_index().search(query, limit)
@@ -0,0 +1,198 @@
+import os
+import re
+import json
+import math
+import threading
+import logging
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+
+from .models import CachedMovie
+from .movie_cache import normalize_title
+
+logger = logging.getLogger(__name__)
+
+CONTENT_INDEX_DIR = Path(os.getenv('CONTENT_INDEX_DIR', settings.BASE_DIR / 'models' / 'content_index'))
+CONTENT_INDEX_MAX_PLOT_TERMS = int(os.getenv('CONTENT_INDEX_MAX_PLOT_TERMS', '2048'))
+CONTENT_INDEX_MAX_PEOPLE = int(os.getenv('CONTENT_INDEX_MAX_PEOPLE', '2048'))
+
+# Relative weight of each feature block in the final vector
+BLOCK_WEIGHTS = {'plot': 1.0, 'genre': 1.0, 'language': 0.5, 'people': 0.75}
+
+STOPWORDS = frozenset("""
+the and for with that this from his her their they them into when while who whom what where which
+are was were has have had but not after before about over under between its it's one two out off
+him she he you your our all any can will would could should than then there these those also
+""".split())
+
+
+def _plot_terms(movie):
+    words = re.findall(r"[a-z][a-z']{2,}", movie.get('Plot', '').lower())
+    return [word for word in words if word not in STOPWORDS]
+
+
+def _list_field(movie, field):
+    value = movie.get(field, '')
+    if not value or value == 'N/A':
+        return []
+    return [item.strip().lower() for item in value.split(',') if item.strip()]
+
+
+def _people(movie):
+    return _list_field(movie, 'Director') + _list_field(movie, 'Actors')
+
+
+def _vocabulary(documents, max_terms=None):
+    frequencies = Counter(term for document in documents for term in set(document))
+    terms = [term for term, _ in frequencies.most_common(max_terms)]
+    return {term: i for i, term in enumerate(terms)}, frequencies
+
+
+def _normalize_rows(block):
+    norms = np.linalg.norm(block, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return block / norms
+
+
+def featurize(movies):
+    """
+    Turn OMDb payloads into L2-normalized float32 vectors:
+    TF-IDF over plots, one-hot genres and languages, and director/cast tokens.
+    """
+    n = len(movies)
+    blocks = []
+
+    plots = [_plot_terms(movie) for movie in movies]
+    vocabulary, frequencies = _vocabulary(plots, CONTENT_INDEX_MAX_PLOT_TERMS)
+    plot_block = np.zeros((n, len(vocabulary)), dtype=np.float32)
+    for row, terms in enumerate(plots):
+        counts = Counter(term for term in terms if term in vocabulary)
+        for term, count in counts.items():
+            idf = math.log((1 + n) / (1 + frequencies[term])) + 1
+            plot_block[row, vocabulary[term]] = count / len(terms) * idf
+    blocks.append(('plot', plot_block))
+
+    for name, extract, limit in (
+        ('genre', lambda movie: _list_field(movie, 'Genre'), None),
+        ('language', lambda movie: _list_field(movie, 'Language'), None),
+        ('people', _people, CONTENT_INDEX_MAX_PEOPLE),
+    ):
+        tokens = [extract(movie) for movie in movies]
+        vocabulary, _ = _vocabulary(tokens, limit)
+        block = np.zeros((n, len(vocabulary)), dtype=np.float32)
+        for row, values in enumerate(tokens):
+            for value in values:
+                if value in vocabulary:
+                    block[row, vocabulary[value]] = 1
+        blocks.append((name, block))
+
+    matrix = np.hstack([_normalize_rows(block) * BLOCK_WEIGHTS[name] for name, block in blocks])
+    return _normalize_rows(matrix).astype(np.float32)
+
+
+def build(output_dir=CONTENT_INDEX_DIR):
+    """
+    Featurize every cached movie and write the index. Returns the number of movies indexed.
+    """
+    movies = [movie.data for movie in CachedMovie.objects.all().only('data')]
+    vectors = featurize(movies) if movies else np.zeros((0, 0), dtype=np.float32)
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    np.save(output_dir / 'vectors.tmp.npy', vectors)
+    os.replace(output_dir / 'vectors.tmp.npy', output_dir / 'vectors.npy')
+
+    # The metadata file is written last; readers reload when it changes
+    meta = {
+        'shape': list(vectors.shape),
+        'imdb_ids': [movie.get('imdbID', '') for movie in movies],
+        'titles': [movie.get('Title', '') for movie in movies],
+    }
+    with open(output_dir / 'meta.tmp.json', 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(output_dir / 'meta.tmp.json', output_dir / 'meta.json')
+    return len(movies)
+
+
+class ContentIndex:
+    """
+    Read-only view of a built index. Vectors are memory-mapped so worker processes share pages.
+    """
+
+    def __init__(self, directory=CONTENT_INDEX_DIR):
+        directory = Path(directory)
+        with open(directory / 'meta.json', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.vectors = np.load(directory / 'vectors.npy', mmap_mode='r')
+        if list(self.vectors.shape) != meta['shape']:
+            raise ValueError('Content index vectors and metadata are out of sync')
+        self.imdb_ids = meta['imdb_ids']
+        self.titles = meta['titles']
+        self.by_imdb_id = {imdb_id: i for i, imdb_id in enumerate(self.imdb_ids) if imdb_id}
+        self.by_title = {normalize_title(title): i for i, title in enumerate(self.titles)}
+
+    def _rows(self, movies):
+        rows = []
+        for movie in movies:
+            row = self.by_imdb_id.get(movie)
+            if row is None:
+                row = self.by_title.get(normalize_title(movie))
+            if row is not None:
+                rows.append(row)
+        return rows
+
+    def more_like(self, movies, k=8):
+        """
+        Return [(title, imdbID, score)] for the movies most similar to the given imdbIDs/titles.
+        """
+        rows = self._rows(movies)
+        if not rows or not len(self.titles):
+            return []
+
+        # One matrix multiply scores every movie against every liked movie
+        scores = (self.vectors @ np.asarray(self.vectors[rows]).T).sum(axis=1)
+        scores[rows] = -np.inf
+
+        k = min(k, len(scores) - len(set(rows)))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.titles[i], self.imdb_ids[i], float(scores[i])) for i in top if scores[i] > 0]
+
+
+_index = {'mtime': None, 'index': None}
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """
+    Return the content index, reopening it after a rebuild. None if it has not been built.
+    """
+    try:
+        mtime = (CONTENT_INDEX_DIR / 'meta.json').stat().st_mtime
+    except OSError:
+        return None
+
+    if mtime != _index['mtime']:
+        with _index_lock:
+            if mtime != _index['mtime']:
+                try:
+                    _index['index'] = ContentIndex(CONTENT_INDEX_DIR)
+                    _index['mtime'] = mtime
+                except Exception as e:
+                    logger.warning(f"Could not load content index: {e}")
+    return _index['index']
+
+
+def more_like_these(movies, k=8):
+    """
+    Titles of cached movies most similar to the given imdbIDs/titles, or [] without an index.
+    """
+    index = get_index()
+    if index is None:
+        return []
+    return [title for title, _, _ in index.more_like(movies, k)]
@@ -0,0 +1,271 @@
+import os
+import hmac
+import json
+import time
+import logging
+import threading
+import contextvars
+from collections import deque
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.http import HttpResponse, HttpResponseForbidden
+
+logger = logging.getLogger(__name__)
+
+# Samples kept per histogram for the rolling percentiles
+METRICS_WINDOW = int(os.getenv('METRICS_WINDOW', '1000'))
+# Clients allowed to scrape /metrics/. Behind a reverse proxy on the same host every
+# client appears as 127.0.0.1, so set METRICS_TOKEN in that setup too
+METRICS_ALLOWED_IPS = set(os.getenv('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(','))
+# When set, scrapers must also send "Authorization: Bearer <token>"
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+METRICS_QUANTILES = (0.5, 0.95, 0.99)
+
+_request_timings = contextvars.ContextVar('request_timings', default=None)
+
+
+class RollingHistogram:
+    """
+    Percentiles over the most recent samples, plus Prometheus-style running count and sum.
+    """
+
+    def __init__(self, window=METRICS_WINDOW):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        with self._lock:
+            self.samples.append(value)
+            self.count += 1
+            self.sum += value
+
+    def snapshot(self):
+        with self._lock:
+            samples = sorted(self.samples)
+            count, total = self.count, self.sum
+        quantiles = {q: samples[min(len(samples) - 1, int(q * len(samples)))] for q in METRICS_QUANTILES} if samples else {}
+        return quantiles, count, total
+
+
+class Registry:
+    """
+    Named histograms per metric family, created on first observation.
+    """
+
+    def __init__(self):
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def observe(self, family, label, value):
+        key = (family, label)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(key, RollingHistogram())
+        histogram.observe(value)
+
+    def render_prometheus(self):
+        families = {
+            'movie_recommender_span_seconds': ('span', 'Time spent in upstream calls and instrumented steps.'),
+            'movie_recommender_request_seconds': ('view', 'End-to-end request latency by view.'),
+        }
+        lines = []
+        for family, (label_name, help_text) in families.items():
+            lines.append(f'# HELP {family} {help_text}')
+            lines.append(f'# TYPE {family} summary')
+            for (name, label), histogram in sorted(self.histograms.items()):
+                if name != family:
+                    continue
+                quantiles, count, total = histogram.snapshot()
+                for q, value in quantiles.items():
+                    lines.append(f'{family}{{{label_name}="{label}",quantile="{q}"}} {value:.6f}')
+                lines.append(f'{family}_sum{{{label_name}="{label}"}} {total:.6f}')
+                lines.append(f'{family}_count{{{label_name}="{label}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+class RequestTimings:
+    """
+    Per-request totals of every span recorded while serving it, including spans
+    recorded on worker threads that were started with the request's context.
+    """
+
+    def __init__(self):
+        self.spans = {}
+        self._lock = threading.Lock()
+
+    def add(self, name, elapsed):
+        with self._lock:
+            total, count = self.spans.get(name, (0.0, 0))
+            self.spans[name] = (total + elapsed, count + 1)
+
+
+def record(name, elapsed):
+    registry.observe('movie_recommender_span_seconds', name, elapsed)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.add(name, elapsed)
+
+
+class span:
+    """
+    Time a block (`with span('omdb'):`) or, as a decorator, every call of a function or coroutine.
+    """
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        record(self.name, time.perf_counter() - self.start)
+
+    def __call__(self, func):
+        name = self.name
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    record(name, time.perf_counter() - start)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+        return wrapper
+
+
+def server_timing_header(timings, total):
+    entries = [
+        f'{name.replace(" ", "_")};dur={elapsed * 1000:.1f};desc="{count} call{"s" if count != 1 else ""}"'
+        for name, (elapsed, count) in sorted(timings.spans.items())
+    ]
+    entries.append(f'total;dur={total * 1000:.1f}')
+    return ', '.join(entries)
+
+
+class TimingMiddleware:
+    """
+    Collect spans per request, then emit a Server-Timing header, a structured
+    timing log line and the request latency histogram sample. For streamed
+    responses the log line and sample wait until the stream closes, since the
+    upstream calls and rendering happen while the body is sent.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        timings, token, start = self._start()
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_timings.reset(token)
+        return self._finish(request, response, timings, start)
+
+    async def __acall__(self, request):
+        timings, token, start = self._start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_timings.reset(token)
+        return self._finish(request, response, timings, start)
+
+    def _start(self):
+        timings = RequestTimings()
+        return timings, _request_timings.set(timings), time.perf_counter()
+
+    def _finish(self, request, response, timings, start):
+        headers_time = time.perf_counter() - start
+        # Only the spans recorded before the headers went out; a stream's later work is in the log line
+        response['Server-Timing'] = server_timing_header(timings, headers_time)
+
+        if not response.streaming:
+            self._complete(request, response, timings, headers_time)
+        elif response.is_async:
+            response.streaming_content = self._timed_async_stream(response.streaming_content, request, response, timings, start)
+        else:
+            response.streaming_content = self._timed_stream(response.streaming_content, request, response, timings, start)
+        return response
+
+    def _timed_stream(self, content, request, response, timings, start):
+        try:
+            iterator = iter(content)
+            while True:
+                # Spans recorded while producing each chunk still count towards this request
+                token = _request_timings.set(timings)
+                try:
+                    chunk = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    _request_timings.reset(token)
+                yield chunk
+        finally:
+            self._complete(request, response, timings, time.perf_counter() - start)
+
+    async def _timed_async_stream(self, content, request, response, timings, start):
+        try:
+            iterator = aiter(content)
+            while True:
+                token = _request_timings.set(timings)
+                try:
+                    chunk = await anext(iterator)
+                except StopAsyncIteration:
+                    return
+                finally:
+                    _request_timings.reset(token)
+                yield chunk
+        finally:
+            self._complete(request, response, timings, time.perf_counter() - start)
+
+    def _complete(self, request, response, timings, total):
+        view = request.resolver_match.url_name if request.resolver_match else 'unmatched'
+        registry.observe('movie_recommender_request_seconds', view, total)
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({
+                'method': request.method,
+                'path': request.path,
+                'view': view,
+                'status': response.status_code,
+                'streamed': response.streaming,
+                'total_ms': round(total * 1000, 1),
+                'spans': {name: {'ms': round(elapsed * 1000, 1), 'count': count}
+                          for name, (elapsed, count) in timings.spans.items()},
+            }))
+
+
+def metrics(request):
+    """
+    Rolling latency percentiles in Prometheus text format, for allowed addresses
+    and, when METRICS_TOKEN is set, only with that bearer token.
+    """
+    if request.META.get('REMOTE_ADDR') not in METRICS_ALLOWED_IPS:
+        return HttpResponseForbidden()
+    if METRICS_TOKEN and not hmac.compare_digest(request.META.get('HTTP_AUTHORIZATION', ''), f'Bearer {METRICS_TOKEN}'):
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render_prometheus(), content_type='text/plain; version=0.0.4')
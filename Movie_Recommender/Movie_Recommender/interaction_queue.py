@@ -0,0 +1,176 @@
+import os
+import atexit
+import threading
+import time
+import logging
+from collections import deque
+
+from .instrumentation import span
+from .supabase_client import supabase
+
+logger = logging.getLogger(__name__)
+
+INTERACTION_QUEUE_MAX_SIZE = int(os.getenv('INTERACTION_QUEUE_MAX_SIZE', '10000'))
+INTERACTION_QUEUE_BATCH_SIZE = int(os.getenv('INTERACTION_QUEUE_BATCH_SIZE', '100'))
+INTERACTION_QUEUE_FLUSH_INTERVAL = float(os.getenv('INTERACTION_QUEUE_FLUSH_INTERVAL', '2'))
+# What to do when the buffer is full: 'drop_newest', 'drop_oldest' or 'block'
+INTERACTION_QUEUE_FULL_POLICY = os.getenv('INTERACTION_QUEUE_FULL_POLICY', 'drop_newest')
+INTERACTION_QUEUE_BLOCK_TIMEOUT = float(os.getenv('INTERACTION_QUEUE_BLOCK_TIMEOUT', '0.5'))
+
+# Every row in a bulk insert must carry the same columns
+INTERACTION_COLUMNS = ('user_id', 'movie_title', 'imdb_id', 'interaction_type', 'mood_context')
+INTERACTION_TYPES = ('viewed', 'liked', 'watchlist')
+# Matches the unique index on user_movie_interactions (see supabase/migrations)
+INTERACTION_CONFLICT_COLUMNS = 'user_id,movie_title,interaction_type'
+
+
+def upsert_interactions(rows, table='user_movie_interactions'):
+    """
+    Insert interaction rows in one call, silently skipping ones already recorded.
+    Returns the rows that were actually inserted.
+    """
+    rows = [{column: row.get(column) for column in INTERACTION_COLUMNS} for row in rows]
+    with span('supabase'):
+        response = supabase.table(table).upsert(
+            rows, on_conflict=INTERACTION_CONFLICT_COLUMNS, ignore_duplicates=True
+        ).execute()
+    return response.data or []
+
+
+class InteractionQueue:
+    """
+    In-process write-behind buffer for user_movie_interactions rows.
+
+    Rows are flushed as one bulk upsert whenever `batch_size` rows are waiting
+    or `flush_interval` seconds have passed, from a background thread.
+    """
+
+    def __init__(self, table='user_movie_interactions', max_size=INTERACTION_QUEUE_MAX_SIZE,
+                 batch_size=INTERACTION_QUEUE_BATCH_SIZE, flush_interval=INTERACTION_QUEUE_FLUSH_INTERVAL,
+                 full_policy=INTERACTION_QUEUE_FULL_POLICY):
+        self.table = table
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.full_policy = full_policy
+        self._rows = deque()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._stopping = False
+        self._metrics = {
+            'enqueued': 0, 'dropped': 0, 'flushed': 0, 'failed': 0,
+            'flushes': 0, 'last_flush_seconds': 0.0, 'total_flush_seconds': 0.0,
+        }
+
+    def enqueue(self, row):
+        """
+        Buffer a row for insertion. Returns False if it was dropped because the buffer is full.
+        """
+        row = {column: row.get(column) for column in INTERACTION_COLUMNS}
+        self._ensure_started()
+
+        with self._cond:
+            if len(self._rows) >= self.max_size:
+                if self.full_policy == 'drop_oldest':
+                    self._rows.popleft()
+                    self._metrics['dropped'] += 1
+                elif self.full_policy == 'block':
+                    deadline = time.monotonic() + INTERACTION_QUEUE_BLOCK_TIMEOUT
+                    while len(self._rows) >= self.max_size and time.monotonic() < deadline:
+                        self._cond.notify_all()
+                        self._cond.wait(deadline - time.monotonic())
+                    if len(self._rows) >= self.max_size:
+                        self._metrics['dropped'] += 1
+                        return False
+                else:
+                    self._metrics['dropped'] += 1
+                    return False
+
+            self._rows.append(row)
+            self._metrics['enqueued'] += 1
+            if len(self._rows) >= self.batch_size:
+                self._cond.notify_all()
+        return True
+
+    def flush(self):
+        """
+        Insert everything currently buffered, one batch at a time.
+        """
+        with self._flush_lock:
+            while True:
+                with self._cond:
+                    batch = [self._rows.popleft() for _ in range(min(self.batch_size, len(self._rows)))]
+                    # Wake producers blocked on a full buffer
+                    self._cond.notify_all()
+                if not batch:
+                    return
+                self._insert(batch)
+
+    def _insert(self, batch):
+        start = time.perf_counter()
+        try:
+            upsert_interactions(batch, self.table)
+            failed = False
+        except Exception as e:
+            logger.warning(f"Failed to flush {len(batch)} interactions: {e}")
+            failed = True
+        elapsed = time.perf_counter() - start
+
+        with self._cond:
+            self._metrics['failed' if failed else 'flushed'] += len(batch)
+            self._metrics['flushes'] += 1
+            self._metrics['last_flush_seconds'] = elapsed
+            self._metrics['total_flush_seconds'] += elapsed
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if len(self._rows) < self.batch_size and not self._stopping:
+                    self._cond.wait(self.flush_interval)
+                stopping = self._stopping
+            self.flush()
+            if stopping:
+                return
+
+    def _ensure_started(self):
+        # A forked worker inherits the thread object but not the thread, so check the pid too
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._cond:
+            if self._thread is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name='interaction-queue', daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout=5):
+        """
+        Stop the background thread after flushing whatever is still buffered.
+        """
+        thread = self._thread
+        if thread is None or self._pid != os.getpid():
+            self.flush()
+            return
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        thread.join(timeout)
+        self._thread = None
+
+    def get_metrics(self):
+        """
+        Return queue depth, throughput counters and flush latency.
+        """
+        with self._cond:
+            metrics = dict(self._metrics)
+            metrics['depth'] = len(self._rows)
+        metrics['avg_flush_seconds'] = metrics['total_flush_seconds'] / metrics['flushes'] if metrics['flushes'] else 0.0
+        return metrics
+
+
+interaction_queue = InteractionQueue()
+
+# Flush-on-shutdown so buffered interactions survive a graceful worker exit
+atexit.register(interaction_queue.stop)
@@ -0,0 +1,108 @@
+import os
+import asyncio
+import threading
+import time
+import logging
+from collections import deque
+
+from .instrumentation import span
+
+logger = logging.getLogger(__name__)
+
+GEMINI_MODEL_NAME = os.getenv('GEMINI_MODEL_NAME', 'gemini-1.5-flash')
+GEMINI_TIMEOUT = float(os.getenv('GEMINI_TIMEOUT', '20'))
+# Number of recent call latencies kept for reporting
+GEMINI_LATENCY_WINDOW = int(os.getenv('GEMINI_LATENCY_WINDOW', '500'))
+
+
+class GeminiClient:
+    """
+    Process-wide Gemini handle: imports and configures the SDK on first use,
+    reuses one model object across requests and records the latency of every call.
+    A forked worker configures its own model rather than reusing the parent's gRPC channel.
+    """
+
+    def __init__(self, api_key, model_name=GEMINI_MODEL_NAME, timeout=GEMINI_TIMEOUT):
+        self.api_key = api_key
+        self.model_name = model_name
+        self.timeout = timeout
+        self._model = None
+        self._pid = os.getpid()
+        self._init_lock = threading.Lock()
+        self._latencies = deque(maxlen=GEMINI_LATENCY_WINDOW)
+        self._stats_lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+
+    @property
+    def model(self):
+        if self._model is None or self._pid != os.getpid():
+            with self._init_lock:
+                if self._model is None or self._pid != os.getpid():
+                    # Silence gRPC's C-core logging before the SDK loads it
+                    os.environ['GRPC_VERBOSITY'] = 'ERROR'
+                    import google.generativeai as genai
+
+                    genai.configure(api_key=self.api_key)
+                    self._model = genai.GenerativeModel(self.model_name)
+                    self._pid = os.getpid()
+        return self._model
+
+    def generate(self, prompt, timeout=None, generation_config=None):
+        """
+        Run generate_content with a per-call timeout and optional generation config.
+        """
+        start = time.perf_counter()
+        failed = False
+        try:
+            with span('gemini'):
+                return self.model.generate_content(
+                    prompt,
+                    generation_config=generation_config,
+                    request_options={'timeout': timeout or self.timeout},
+                )
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._record(time.perf_counter() - start, failed)
+
+    async def generate_async(self, prompt, timeout=None, generation_config=None):
+        """
+        Awaitable generate for async views, bounded by the same timeout.
+        """
+        start = time.perf_counter()
+        failed = False
+        try:
+            with span('gemini'):
+                return await asyncio.wait_for(
+                    self.model.generate_content_async(prompt, generation_config=generation_config),
+                    timeout or self.timeout,
+                )
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._record(time.perf_counter() - start, failed)
+
+    def _record(self, elapsed, failed):
+        with self._stats_lock:
+            self.calls += 1
+            self.errors += int(failed)
+            self._latencies.append(elapsed)
+
+    def get_latency_stats(self):
+        """
+        Return call counts and latency summary (seconds) over the recent window.
+        """
+        with self._stats_lock:
+            latencies = sorted(self._latencies)
+            stats = {'calls': self.calls, 'errors': self.errors}
+
+        if latencies:
+            stats.update({
+                'avg': sum(latencies) / len(latencies),
+                'p50': latencies[len(latencies) // 2],
+                'max': latencies[-1],
+            })
+        return stats
@@ -0,0 +1,93 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from Movie_Recommender import card_renderer
+from Movie_Recommender.models import CachedMovie
+from Movie_Recommender.views import format_movie_details
+
+
+def legacy_get_streaming_links(movie_title, imdb_id):
+    return [
+        {'name': 'Netflix', 'url': f'https://www.netflix.com/search?q={movie_title.replace(" ", "%20")}', 'color': '#E50914'},
+        {'name': 'Amazon Prime', 'url': f'https://www.amazon.com/s?k={movie_title.replace(" ", "+")}+movie', 'color': '#00A8E1'},
+        {'name': 'Disney+', 'url': f'https://www.disneyplus.com/search/{movie_title.replace(" ", "%20")}', 'color': '#113CCF'},
+        {'name': 'Hulu', 'url': f'https://www.hulu.com/search?q={movie_title.replace(" ", "%20")}', 'color': '#1CE783'},
+        {'name': 'YouTube Movies', 'url': f'https://www.youtube.com/results?search_query={movie_title.replace(" ", "+")}+full+movie', 'color': '#FF0000'},
+        {'name': 'IMDb', 'url': f'https://www.imdb.com/title/{imdb_id}/' if imdb_id else f'https://www.imdb.com/find?q={movie_title.replace(" ", "+")}', 'color': '#F5C518'}
+    ]
+
+
+def legacy_render_movie_card(movie_details):
+    """
+    The f-string renderer cards were built with before fragment caching, kept as the baseline.
+    """
+    streaming_links = legacy_get_streaming_links(movie_details['title'], movie_details['imdbID'])
+
+    streaming_buttons = ''.join([
+        f'<a href="{link["url"]}" target="_blank" class="streaming-link" style="background-color: {link["color"]}">{link["name"]}</a>'
+        for link in streaming_links
+    ])
+
+    return f'''
+        <div class="enhanced-movie-card" data-imdbid="{movie_details['imdbID']}">
+            <div class="movie-poster-container">
+                <img src="{movie_details['poster']}" alt="{movie_details['title']}" class="enhanced-movie-poster">
+                <div class="movie-overlay">
+                    <div class="movie-rating">⭐ {movie_details['rating']}</div>
+                </div>
+                <div class="movie-actions">
+                    <button class="action-btn like-btn" data-movie="{movie_details['title']}" data-imdb="{movie_details['imdbID']}">❤️</button>
+                    <button class="action-btn watchlist-btn" data-movie="{movie_details['title']}" data-imdb="{movie_details['imdbID']}">📋</button>
+                </div>
+            </div>
+            <div class="enhanced-movie-info">
+                <h3 class="enhanced-movie-title">{movie_details['title']}</h3>
+                <p class="movie-year-genre">{movie_details['year']} • {movie_details['genre']}</p>
+                <p class="movie-runtime">⏱️ {movie_details['runtime']}</p>
+                <p class="movie-plot">{movie_details['plot'][:100]}{'...' if len(movie_details['plot']) > 100 else ''}</p>
+                <div class="streaming-links">
+                    {streaming_buttons}
+                </div>
+            </div>
+        </div>
+        '''
+
+
+def sample_movies(count):
+    movies = [format_movie_details(movie.data, movie.title) for movie in CachedMovie.objects.all()[:count]]
+    for i in range(len(movies), count):
+        movies.append(format_movie_details({
+            'Response': 'True', 'Title': f'Sample Movie {i}', 'imdbID': f'tt{9000000 + i}', 'Year': '2020',
+            'Genre': 'Drama, Comedy', 'Plot': 'A long enough plot to be truncated on the card. ' * 4,
+            'imdbRating': '7.5', 'Runtime': '120 min', 'Poster': 'https://example.com/poster.jpg',
+        }, f'Sample Movie {i}'))
+    return movies
+
+
+class Command(BaseCommand):
+    help = "Measure movie card render cost per card: legacy f-strings vs compiled template vs fragment cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cards', type=int, default=10, help="Cards per page.")
+        parser.add_argument('--pages', type=int, default=500, help="Pages rendered per measurement.")
+
+    def handle(self, *args, **options):
+        movies = sample_movies(options['cards'])
+        pages = options['pages']
+
+        def measure(render_page):
+            start = time.perf_counter()
+            for _ in range(pages):
+                render_page()
+            return (time.perf_counter() - start) / (pages * len(movies)) * 1e6
+
+        legacy = measure(lambda: ''.join(legacy_render_movie_card(movie) for movie in movies).encode('utf-8'))
+        template = measure(lambda: b''.join(card_renderer.render_card(movie) for movie in movies))
+        card_renderer.fragment_cache.clear()
+        cached = measure(lambda: b''.join(card_renderer.get_card(movie) for movie in movies))
+
+        self.stdout.write(f"{len(movies)} cards x {pages} pages, cost per card:")
+        self.stdout.write(f"  legacy f-strings:       {legacy:8.1f} us")
+        self.stdout.write(f"  compiled template:      {template:8.1f} us  (escapes every value; cache misses only)")
+        self.stdout.write(f"  fragment cache (warm):  {cached:8.1f} us  ({legacy / cached:.0f}x faster than legacy)")
@@ -0,0 +1,90 @@
+import json
+import os
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from Movie_Recommender import mood_classifier
+
+
+def _percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+class Command(BaseCommand):
+    help = "Compare latency and agreement of the local mood classifier with the LLM."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--file', default=str(mood_classifier.MOOD_TRAINING_FILE),
+                            help="JSON lines file with 'text' (and optionally 'label') fields.")
+        parser.add_argument('--limit', type=int, default=50,
+                            help="Number of moods to send to the LLM.")
+        parser.add_argument('--no-llm', action='store_true',
+                            help="Only measure the local classifier.")
+        parser.add_argument('--folds', type=int, default=5,
+                            help="Cross-validation folds when --file is the training set.")
+
+    def handle(self, *args, **options):
+        with open(options['file'], encoding='utf-8') as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+
+        # Training happens on first use; keep it out of the per-call numbers
+        start = time.perf_counter()
+        mood_classifier.get_classifier()
+        self.stdout.write(f"Training: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        local = []
+        local_times = []
+        for row in rows:
+            start = time.perf_counter()
+            local.append(mood_classifier.classify_mood(row['text']))
+            local_times.append(time.perf_counter() - start)
+
+        confident = sum(confidence >= mood_classifier.MOOD_CLASSIFIER_THRESHOLD for _, confidence in local)
+        self.stdout.write(
+            f"Local: {len(rows)} moods, p50 {_percentile(local_times, 0.5) * 1e6:.0f} us, "
+            f"p95 {_percentile(local_times, 0.95) * 1e6:.0f} us, "
+            f"{confident / len(rows):.0%} above threshold {mood_classifier.MOOD_CLASSIFIER_THRESHOLD}"
+        )
+        if os.path.samefile(options['file'], mood_classifier.MOOD_TRAINING_FILE):
+            # The production classifier has seen every row, so score it on folds it was not trained on
+            accuracy = self.cross_validate(mood_classifier.load_training_examples(), options['folds'])
+            self.stdout.write(f"Local accuracy ({options['folds']}-fold cross-validation): {accuracy:.0%}")
+        else:
+            labelled = [(label, row['label']) for (label, _), row in zip(local, rows) if 'label' in row]
+            if labelled:
+                self.stdout.write(f"Local accuracy vs held-out labels: {sum(a == b for a, b in labelled) / len(labelled):.0%}")
+
+        if options['no_llm']:
+            return
+
+        from Movie_Recommender.utils import analyze_mood_sentiment_with_llm
+
+        llm_times = []
+        agreements = 0
+        sample = rows[:options['limit']]
+        for row, (label, _) in zip(sample, local):
+            start = time.perf_counter()
+            answer = analyze_mood_sentiment_with_llm(row['text'])
+            llm_times.append(time.perf_counter() - start)
+            # The LLM may answer 'happy/joyful'; compare on the leading category word
+            agreements += answer.split('/')[0].strip() == label
+
+        self.stdout.write(
+            f"LLM: {len(sample)} moods, p50 {_percentile(llm_times, 0.5) * 1000:.0f} ms, "
+            f"p95 {_percentile(llm_times, 0.95) * 1000:.0f} ms"
+        )
+        self.stdout.write(f"Agreement with LLM: {agreements / len(sample):.0%}")
+
+    def cross_validate(self, examples, folds):
+        examples = list(examples)
+        random.Random(0).shuffle(examples)
+        correct = 0
+        for fold in range(folds):
+            held_out = examples[fold::folds]
+            training = [example for i, example in enumerate(examples) if i % folds != fold]
+            classifier = mood_classifier.MoodClassifier.train(training)
+            correct += sum(classifier.predict(text)[0] == label for text, label in held_out)
+        return correct / len(examples)
@@ -0,0 +1,351 @@
+import io
+import os
+import json
+import time
+import random
+import logging
+import tempfile
+import threading
+from collections import Counter
+from contextlib import redirect_stdout
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+import jwt
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+
+from Movie_Recommender import (
+    interaction_queue, mood_classifier, movie_search, omdb_client, snapshots, supabase_auth, utils, views,
+)
+
+BENCH_JWT_SECRET = 'benchmark-views-signing-secret-0001'
+BENCH_USERS = 20
+
+
+def _percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+class Upstream:
+    """
+    Injected latency (seconds) and error rate for one stubbed service.
+    """
+
+    def __init__(self, latency_ms, error_rate):
+        self.latency = latency_ms / 1000
+        self.error_rate = error_rate
+
+    def call(self):
+        if self.latency:
+            time.sleep(self.latency)
+        return random.random() >= self.error_rate
+
+
+def start_omdb_stub(upstream):
+    """
+    Serve OMDb-shaped answers for any title, imdbID or search on a local port.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            params = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+            if not upstream.call():
+                self.send_response(503)
+                self.end_headers()
+                return
+
+            if 's' in params:
+                body = {'Response': 'True', 'totalResults': '30', 'Search': [
+                    {'Title': f"{params['s'].title()} {i}", 'Year': str(2000 + i), 'imdbID': f'tt{8000000 + i:07d}',
+                     'Type': 'movie', 'Poster': 'N/A'} for i in range(10)
+                ]}
+            else:
+                title = params.get('t') or f"Movie {params.get('i')}"
+                imdb_id = params.get('i') or 'tt%07d' % (abs(hash(title.casefold())) % 10 ** 7)
+                body = {'Response': 'True', 'Title': title, 'imdbID': imdb_id, 'Year': params.get('y', '2010'),
+                        'Genre': 'Drama, Comedy', 'Director': 'Stub Director', 'Actors': 'A. Actor, B. Actor',
+                        'Plot': f'A benchmark plot about {title}. ' * 3, 'imdbRating': '7.1', 'imdbVotes': '12,345',
+                        'Runtime': '110 min', 'Language': 'English', 'Metascore': '70',
+                        'Poster': 'https://example.com/poster.jpg'}
+
+            payload = json.dumps(body).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class StubGeminiModel:
+    """
+    Stands in for genai.GenerativeModel with canned answers in the shapes utils.py parses.
+    """
+
+    def __init__(self, upstream, titles):
+        self.upstream = upstream
+        self.titles = titles
+
+    def _answer(self, prompt, generation_config):
+        if not self.upstream.call():
+            raise RuntimeError('Injected Gemini error')
+        offset = abs(hash(prompt)) % len(self.titles)
+        titles = (self.titles[offset:] + self.titles[:offset])[:8]
+        if generation_config:
+            text = json.dumps({'mood_category': 'happy', 'movies': [{'title': title, 'year': None} for title in titles]})
+        elif 'primary emotion' in prompt:
+            text = 'happy'
+        else:
+            text = ', '.join(titles)
+        return SimpleNamespace(text=text)
+
+    def generate_content(self, prompt, generation_config=None, request_options=None):
+        return self._answer(prompt, generation_config)
+
+    async def generate_content_async(self, prompt, generation_config=None):
+        return self._answer(prompt, generation_config)
+
+
+class StubQuery:
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.filters = {}
+        self.rows = None
+        self.limit_count = None
+        self.conflict_columns = None
+
+    def select(self, *args):
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = value
+        return self
+
+    def order(self, *args, **kwargs):
+        return self
+
+    def limit(self, count):
+        self.limit_count = count
+        return self
+
+    def range(self, start, end):
+        return self
+
+    def insert(self, rows):
+        self.rows = rows if isinstance(rows, list) else [rows]
+        return self
+
+    def upsert(self, rows, on_conflict='', ignore_duplicates=False):
+        self.rows = rows
+        self.conflict_columns = on_conflict.split(',') if on_conflict else None
+        return self
+
+    def execute(self):
+        if not self.client.upstream.call():
+            raise RuntimeError('Injected Supabase error')
+
+        with self.client.lock:
+            stored = self.client.tables.setdefault(self.table, [])
+            if self.rows is None:
+                data = [row for row in reversed(stored) if all(row.get(k) == v for k, v in self.filters.items())]
+                return SimpleNamespace(data=data[:self.limit_count])
+
+            inserted = []
+            for row in self.rows:
+                row = dict(row, id=len(stored) + 1)
+                if self.conflict_columns:
+                    key = tuple(row.get(column) for column in self.conflict_columns)
+                    if key in self.client.keys.setdefault(self.table, set()):
+                        continue
+                    self.client.keys[self.table].add(key)
+                stored.append(row)
+                inserted.append(row)
+            return SimpleNamespace(data=inserted)
+
+
+class StubSupabase:
+    """
+    In-memory stand-in for the parts of the Supabase client the views use.
+    """
+
+    def __init__(self, upstream):
+        self.upstream = upstream
+        self.tables = {}
+        self.keys = {}
+        self.lock = threading.Lock()
+        self.auth = SimpleNamespace(get_user=self._get_user)
+
+    def table(self, name):
+        return StubQuery(self, name)
+
+    def _get_user(self, token):
+        self.upstream.call()
+        claims = jwt.decode(token, options={'verify_signature': False})
+        return SimpleNamespace(user=SimpleNamespace(id=claims['sub'], email=claims.get('email')))
+
+
+SCENARIOS = ('mood', 'trending', 'recent', 'details', 'bulk_details', 'search', 'user_recommendations', 'track')
+
+
+class Command(BaseCommand):
+    help = "Load-test the real views against local Gemini, OMDb and Supabase stand-ins and report throughput."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                            help=f"Comma-separated scenarios to run, any of: {', '.join(SCENARIOS)}.")
+        parser.add_argument('--requests', type=int, default=200, help="Requests per scenario.")
+        parser.add_argument('--concurrency', type=int, default=8, help="Concurrent clients.")
+        parser.add_argument('--omdb-latency', type=float, default=50, help="Injected OMDb latency in ms.")
+        parser.add_argument('--omdb-error-rate', type=float, default=0.0)
+        parser.add_argument('--gemini-latency', type=float, default=300, help="Injected Gemini latency in ms.")
+        parser.add_argument('--gemini-error-rate', type=float, default=0.0)
+        parser.add_argument('--supabase-latency', type=float, default=30, help="Injected Supabase latency in ms.")
+        parser.add_argument('--supabase-error-rate', type=float, default=0.0)
+        parser.add_argument('--json', help="Also write the results to this JSON file (for CI comparisons).")
+        parser.add_argument('--verbose', action='store_true', help="Show the views' own output during the run.")
+
+    def handle(self, *args, **options):
+        scenarios = [name for name in options['scenarios'].split(',') if name]
+        unknown = set(scenarios) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+        self.use_throwaway_database()
+        context = self.install_stubs(options)
+        logging.getLogger('Movie_Recommender.instrumentation').setLevel(logging.WARNING)
+        if not options['verbose']:
+            # Injected upstream errors would otherwise log a traceback per failed request
+            logging.getLogger('django.request').setLevel(logging.CRITICAL)
+
+        results = {}
+        for name in scenarios:
+            output = io.StringIO()
+            with redirect_stdout(self.stdout._out if options['verbose'] else output):
+                results[name] = self.run_scenario(name, context, options['requests'], options['concurrency'])
+            self.report(name, results[name])
+
+        interaction_queue.interaction_queue.stop()
+        if options['json']:
+            with open(options['json'], 'w', encoding='utf-8') as f:
+                json.dump({'options': {key: options[key] for key in (
+                    'requests', 'concurrency', 'omdb_latency', 'omdb_error_rate', 'gemini_latency',
+                    'gemini_error_rate', 'supabase_latency', 'supabase_error_rate')}, 'results': results}, f, indent=2)
+
+    def use_throwaway_database(self):
+        """
+        Point the default connection at a fresh SQLite file so the run never touches real data
+        and starts with cold caches.
+        """
+        connection = connections['default']
+        if connection.vendor != 'sqlite':
+            raise CommandError("benchmark_views runs against a throwaway SQLite database")
+        connection.close()
+        connection.settings_dict['NAME'] = os.path.join(tempfile.mkdtemp(prefix='benchmark-'), 'db.sqlite3')
+        call_command('migrate', verbosity=0)
+
+    def install_stubs(self, options):
+        titles = [title for titles in snapshots.get_movie_lists().values() for title in titles]
+        titles += [title for titles in utils.FALLBACK_MOOD_MOVIES.values() for title in titles]
+
+        omdb_server = start_omdb_stub(Upstream(options['omdb_latency'], options['omdb_error_rate']))
+        omdb_client.OMDB_BASE_URL = f'http://127.0.0.1:{omdb_server.server_address[1]}/'
+
+        utils.gemini._model = StubGeminiModel(Upstream(options['gemini_latency'], options['gemini_error_rate']), titles)
+
+        stub_supabase = StubSupabase(Upstream(options['supabase_latency'], options['supabase_error_rate']))
+        for module in (views, interaction_queue, supabase_auth):
+            module.supabase = stub_supabase
+        supabase_auth.SUPABASE_JWT_SECRET = BENCH_JWT_SECRET
+
+        # Every benchmark client shares one address; do not let the per-client limiters throttle the load
+        movie_search.search_limiter.rate = movie_search.search_limiter.burst = float('inf')
+        views.bulk_details_limiter.rate = views.bulk_details_limiter.burst = float('inf')
+
+        users = [f'bench-user-{i}' for i in range(BENCH_USERS)]
+        for i, user in enumerate(users):
+            for title in titles[i:i + 5]:
+                stub_supabase.tables.setdefault('user_movie_interactions', []).append({
+                    'user_id': user, 'movie_title': title, 'interaction_type': 'liked', 'created_at': '2026-01-01',
+                })
+
+        tokens = [jwt.encode({'sub': user, 'email': f'{user}@example.com', 'aud': supabase_auth.SUPABASE_JWT_AUDIENCE,
+                              'exp': int(time.time()) + 24 * 3600}, BENCH_JWT_SECRET, algorithm='HS256')
+                  for user in users]
+        moods = [text for text, _ in mood_classifier.load_training_examples()]
+        return SimpleNamespace(titles=titles, tokens=tokens, moods=moods)
+
+    def build_request(self, name, i, context):
+        auth = {'HTTP_AUTHORIZATION': f'Bearer {context.tokens[i % len(context.tokens)]}'}
+        title = context.titles[i % len(context.titles)]
+        if name == 'mood':
+            return 'post', '/mood-recommendations/', {'data': {'mood': context.moods[i % len(context.moods)]}}
+        if name in ('trending', 'recent'):
+            return 'get', f'/{name}-movies/', {}
+        if name == 'details':
+            return 'get', f'/movie-details/tt{1000000 + i % 50:07d}/', {}
+        if name == 'bulk_details':
+            movies = [context.titles[(i + j) % len(context.titles)] for j in range(10)]
+            return 'post', '/api/movies/details/', {'data': json.dumps({'movies': movies, 'fields': ['Title', 'Poster']}),
+                                                    'content_type': 'application/json'}
+        if name == 'search':
+            return 'get', '/api/search/', {'data': {'q': title.split(':')[0]}}
+        if name == 'user_recommendations':
+            return 'get', '/api/user/recommendations/', auth
+        return 'post', '/api/movies/track/', dict(auth, data=json.dumps({
+            'movie_title': title, 'interaction_type': ('viewed', 'liked', 'watchlist')[i % 3]}),
+            content_type='application/json')
+
+    def run_scenario(self, name, context, count, concurrency):
+        local = threading.local()
+
+        def one(i):
+            if not hasattr(local, 'client'):
+                local.client = Client()
+            method, path, kwargs = self.build_request(name, i, context)
+            start = time.perf_counter()
+            try:
+                response = getattr(local.client, method)(path, **kwargs)
+                if response.streaming:
+                    b''.join(response.streaming_content)
+                status = response.status_code
+            except Exception:
+                status = 'exception'
+            return time.perf_counter() - start, status
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            samples = list(executor.map(one, range(count)))
+        elapsed = time.perf_counter() - start
+
+        latencies = [latency for latency, _ in samples]
+        statuses = Counter(str(status) for _, status in samples)
+        return {
+            'requests': count,
+            'errors': sum(n for status, n in statuses.items() if not status.isdigit() or int(status) >= 500),
+            'statuses': dict(statuses),
+            'seconds': round(elapsed, 3),
+            'rps': round(count / elapsed, 1),
+            'p50_ms': round(_percentile(latencies, 0.5) * 1000, 1),
+            'p95_ms': round(_percentile(latencies, 0.95) * 1000, 1),
+            'p99_ms': round(_percentile(latencies, 0.99) * 1000, 1),
+        }
+
+    def report(self, name, result):
+        self.stdout.write(
+            f"{name:<22} {result['requests']:>5} req  {result['rps']:>8.1f} req/s  "
+            f"p50 {result['p50_ms']:>7.1f} ms  p95 {result['p95_ms']:>7.1f} ms  p99 {result['p99_ms']:>7.1f} ms  "
+            f"errors {result['errors']}  statuses {', '.join(f'{k}:{v}' for k, v in sorted(result['statuses'].items()))}"
+        )
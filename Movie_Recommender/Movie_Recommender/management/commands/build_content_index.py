@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from Movie_Recommender import content_index
+
+
+class Command(BaseCommand):
+    help = "Build the content-based similarity index from cached OMDb metadata."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=str(content_index.CONTENT_INDEX_DIR),
+                            help="Directory to write the index to.")
+
+    def handle(self, *args, **options):
+        start = time.monotonic()
+        count = content_index.build(options['output'])
+        self.stdout.write(
+            f"Indexed {count} movies in {time.monotonic() - start:.2f}s, wrote {options['output']}"
+        )
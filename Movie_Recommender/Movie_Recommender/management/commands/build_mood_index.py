@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from Movie_Recommender import mood_index
+
+
+class Command(BaseCommand):
+    help = "Build the embedding index used to retrieve movies for a mood without an LLM call."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=str(mood_index.MOOD_INDEX_PATH),
+                            help="Where to write the index file.")
+
+    def handle(self, *args, **options):
+        start = time.monotonic()
+        documents = mood_index.movie_documents()
+        index = mood_index.MoodIndex.build(documents)
+        index.save(options['output'])
+        self.stdout.write(
+            f"Indexed {len(documents)} movies into {len(index.centroids)} lists "
+            f"in {time.monotonic() - start:.2f}s, wrote {options['output']}"
+        )
@@ -0,0 +1,65 @@
+import os
+import re
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# SDKs that must only be imported on first use, never while booting a worker
+LAZY_MODULES = ('supabase', 'google.generativeai', 'httpx')
+
+IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+STARTUP_SCRIPT = """
+import django
+django.setup()
+import {module}
+"""
+
+
+class Command(BaseCommand):
+    help = "Fail if booting a worker (Django setup plus the URLconf) exceeds an import-time budget or loads a lazy SDK."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--budget-ms', type=float, default=float(os.getenv('IMPORT_TIME_BUDGET_MS', '800')),
+                            help="Maximum cumulative import time in milliseconds.")
+        parser.add_argument('--module', default=settings.ROOT_URLCONF,
+                            help="Module imported after django.setup(); defaults to the URLconf.")
+        parser.add_argument('--top', type=int, default=10, help="Slowest top-level imports to list.")
+
+    def handle(self, *args, **options):
+        # A fresh interpreter, since this process has already imported everything
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', STARTUP_SCRIPT.format(module=options['module'])],
+            cwd=settings.BASE_DIR, capture_output=True, text=True,
+            env=dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'Movie_Recommender.settings')),
+        )
+        if result.returncode:
+            raise CommandError(f"Startup import failed:\n{result.stderr[-2000:]}")
+
+        top_level = []
+        loaded = set()
+        for line in result.stderr.splitlines():
+            match = IMPORT_TIME_LINE.match(line)
+            if not match:
+                continue
+            cumulative_us, depth, name = int(match.group(2)), len(match.group(3)), match.group(4)
+            loaded.add(name)
+            if depth == 1:
+                top_level.append((cumulative_us, name))
+
+        total_ms = sum(us for us, _ in top_level) / 1000
+        self.stdout.write(f"Importing {options['module']} after django.setup(): {total_ms:.0f} ms (budget {options['budget_ms']:.0f} ms)")
+        for us, name in sorted(top_level, reverse=True)[:options['top']]:
+            self.stdout.write(f"  {us / 1000:8.1f} ms  {name}")
+
+        eager = [module for module in LAZY_MODULES if module in loaded]
+        problems = []
+        if eager:
+            problems.append(f"imported at startup but should load on first use: {', '.join(eager)}")
+        if total_ms > options['budget_ms']:
+            problems.append(f"{total_ms:.0f} ms exceeds the {options['budget_ms']:.0f} ms budget")
+        if problems:
+            raise CommandError('; '.join(problems))
+        self.stdout.write(self.style.SUCCESS("Import time within budget"))
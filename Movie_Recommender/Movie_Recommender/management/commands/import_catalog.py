@@ -0,0 +1,83 @@
+import csv
+import gzip
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from Movie_Recommender.catalog import parse_votes, parse_year
+from Movie_Recommender.models import CatalogTitle
+
+BATCH_SIZE = 5000
+
+
+def _open(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', newline='')
+    return open(path, encoding='utf-8', newline='')
+
+
+def _read_votes(path):
+    """
+    imdbID -> vote count from an IMDb title.ratings.tsv dump.
+    """
+    with _open(path) as f:
+        return {row['tconst']: parse_votes(row['numVotes'])
+                for row in csv.DictReader(f, delimiter='\t', quoting=csv.QUOTE_NONE)}
+
+
+def _read_titles(path, title_types, votes):
+    """
+    Yield (imdb_id, title, year, votes) from an IMDb title.basics.tsv dump or a CSV
+    with imdb_id,title[,year][,votes] columns.
+    """
+    with _open(path) as f:
+        if '.tsv' in path:
+            for row in csv.DictReader(f, delimiter='\t', quoting=csv.QUOTE_NONE):
+                if row['titleType'] in title_types:
+                    yield row['tconst'], row['primaryTitle'], parse_year(row['startYear']), votes.get(row['tconst'], 0)
+        else:
+            for row in csv.DictReader(f):
+                imdb_id = row['imdb_id']
+                yield imdb_id, row['title'], parse_year(row.get('year')), parse_votes(row.get('votes') or votes.get(imdb_id, 0))
+
+
+class Command(BaseCommand):
+    help = "Import a bulk title dataset into the local movie catalog."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="IMDb title.basics.tsv(.gz) or a CSV with imdb_id,title,year,votes columns.")
+        parser.add_argument('--ratings', help="IMDb title.ratings.tsv(.gz), used to rank titles by votes.")
+        parser.add_argument('--types', default='movie,tvMovie',
+                            help="Comma-separated IMDb title types to keep (TSV only).")
+        parser.add_argument('--min-votes', type=int, default=0,
+                            help="Skip titles with fewer votes; keeps the in-memory index small.")
+
+    def handle(self, *args, **options):
+        start = time.monotonic()
+        votes = _read_votes(options['ratings']) if options['ratings'] else {}
+        title_types = set(options['types'].split(','))
+
+        imported = skipped = 0
+        batch = []
+        try:
+            for imdb_id, title, year, vote_count in _read_titles(options['path'], title_types, votes):
+                if not imdb_id or not title or vote_count < options['min_votes']:
+                    skipped += 1
+                    continue
+                batch.append(CatalogTitle(imdb_id=imdb_id, title=title[:255], year=year, votes=vote_count))
+                if len(batch) >= BATCH_SIZE:
+                    imported += self._write(batch)
+                    batch = []
+        except (OSError, KeyError, csv.Error) as e:
+            raise CommandError(f"Could not read {options['path']}: {e}")
+        imported += self._write(batch)
+
+        self.stdout.write(
+            f"Imported {imported} titles ({skipped} skipped) in {time.monotonic() - start:.2f}s"
+        )
+
+    def _write(self, batch):
+        CatalogTitle.objects.bulk_create(
+            batch, update_conflicts=True, unique_fields=['imdb_id'], update_fields=['title', 'year', 'votes']
+        )
+        return len(batch)
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from Movie_Recommender import snapshots
+
+
+class Command(BaseCommand):
+    help = "Precompute the rendered trending/recent movie card snapshots."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'lists', nargs='*',
+            help="Lists to refresh (default: every list in the movie lists file)."
+        )
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help="Keep running and refresh every INTERVAL seconds."
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            names = options['lists'] or list(snapshots.get_movie_lists())
+            for name in names:
+                start = time.monotonic()
+                try:
+                    snapshot = snapshots.refresh_snapshot(name)
+                except Exception as e:
+                    self.stderr.write(f"Failed to refresh {name}: {e}")
+                    continue
+                self.stdout.write(
+                    f"Refreshed {name}: {len(snapshot['titles'])} movies, "
+                    f"etag {snapshot['etag']} in {time.monotonic() - start:.2f}s"
+                )
+
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
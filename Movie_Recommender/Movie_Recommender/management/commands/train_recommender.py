@@ -0,0 +1,44 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+from supabase import create_client
+
+from Movie_Recommender import recommender
+
+PAGE_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = "Train the item-item collaborative filtering model from user_movie_interactions."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-k', type=int, default=recommender.RECOMMENDER_TOP_K,
+                            help="Neighbours kept per movie.")
+        parser.add_argument('--output', default=str(recommender.RECOMMENDER_MODEL_PATH),
+                            help="Where to write the model file.")
+
+    def handle(self, *args, **options):
+        # Row level security hides other users' interactions from the anon key
+        key = os.getenv('SUPABASE_SERVICE_ROLE_KEY') or os.getenv('VITE_SUPABASE_ANON_KEY')
+        client = create_client(os.getenv('VITE_SUPABASE_URL'), key)
+
+        start = time.monotonic()
+        rows = []
+        while True:
+            page = client.table('user_movie_interactions') \
+                .select('user_id,movie_title,interaction_type') \
+                .range(len(rows), len(rows) + PAGE_SIZE - 1) \
+                .execute()
+            rows.extend(page.data)
+            if len(page.data) < PAGE_SIZE:
+                break
+        self.stdout.write(f"Loaded {len(rows)} interactions in {time.monotonic() - start:.2f}s")
+
+        start = time.monotonic()
+        model = recommender.train(rows, top_k=options['top_k'])
+        model.save(options['output'])
+        self.stdout.write(
+            f"Trained on {len(model.titles)} movies in {time.monotonic() - start:.2f}s, "
+            f"wrote {options['output']}"
+        )
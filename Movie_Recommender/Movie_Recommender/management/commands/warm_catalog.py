@@ -0,0 +1,194 @@
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from Movie_Recommender import movie_cache, omdb_client, snapshots
+from Movie_Recommender.rate_limit import TokenBucketLimiter
+from Movie_Recommender.utils import FALLBACK_MOOD_MOVIES
+from Movie_Recommender.views import fetch_movie_data, movie_query_kwargs
+
+SOURCES = ('lists', 'moods', 'interactions')
+PAGE_SIZE = 1000
+# Progress is saved after this many completed movies
+CHECKPOINT_EVERY = 25
+
+
+def _percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+class Command(BaseCommand):
+    help = "Pre-populate the movie metadata cache so the first users after a deploy hit warm caches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--file', action='append', default=[],
+                            help="Text file with one title or imdbID per line (repeatable).")
+        parser.add_argument('--sources', default=','.join(SOURCES),
+                            help=f"Built-in title sources to include, any of: {', '.join(SOURCES)}.")
+        parser.add_argument('--top-interactions', type=int, default=200,
+                            help="Number of most-interacted titles taken from user_movie_interactions.")
+        parser.add_argument('--workers', type=int, default=4,
+                            help="Concurrent OMDb requests.")
+        parser.add_argument('--rate', type=float, default=5,
+                            help="Maximum OMDb requests per second.")
+        parser.add_argument('--progress', default=str(settings.BASE_DIR / 'models' / 'warm_catalog_progress.json'),
+                            help="Progress file of an interrupted run; movies recorded there are skipped on the next run. "
+                                 "Removed once a run completes without failures.")
+        parser.add_argument('--reset', action='store_true',
+                            help="Ignore previous progress.")
+
+    def handle(self, *args, **options):
+        queries = self.collect_queries(options)
+        done = set() if options['reset'] else self.load_progress(options['progress'])
+        pending = [query for query in queries if query not in done]
+        self.stdout.write(f"{len(queries)} movies to warm, {len(queries) - len(pending)} already done in a previous run")
+
+        limiter = TokenBucketLimiter(options['rate'], max(1, options['workers']))
+        counts = Counter()
+        latencies = []
+        start = time.monotonic()
+
+        def warm(query):
+            kwargs = movie_query_kwargs(query)
+            cached = movie_cache.lookup_imdb_id(kwargs['imdb_id']) if 'imdb_id' in kwargs else movie_cache.lookup_title(query)
+            if cached is movie_cache.NOT_FOUND:
+                return 'not_found', None
+            if cached is not None:
+                return 'cached', None
+
+            while True:
+                wait = limiter.acquire('omdb')
+                if not wait:
+                    break
+                time.sleep(wait)
+
+            fetch_start = time.monotonic()
+            data = fetch_movie_data(**kwargs)
+            return ('fetched' if data else 'not_found'), time.monotonic() - fetch_start
+
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            futures = {executor.submit(warm, query): query for query in pending}
+            for future in as_completed(futures):
+                query = futures[future]
+                try:
+                    outcome, latency = future.result()
+                except omdb_client.OMDbUnavailable as e:
+                    counts['failed'] += 1
+                    self.stderr.write(f"Failed {query}: {e}")
+                    if omdb_client.breaker.is_open:
+                        # Quota exhausted or OMDb down: stop here and resume on the next run
+                        self.stderr.write("OMDb circuit breaker opened, stopping early")
+                        for other in futures:
+                            other.cancel()
+                        break
+                    continue
+
+                counts[outcome] += 1
+                if latency is not None:
+                    latencies.append(latency)
+                done.add(query)
+                if sum(counts.values()) % CHECKPOINT_EVERY == 0:
+                    self.save_progress(options['progress'], done)
+
+        if counts['failed'] or sum(counts.values()) < len(pending):
+            self.save_progress(options['progress'], done)
+            self.stdout.write(f"Progress saved to {options['progress']}; the next run resumes from there")
+        else:
+            # Finished: the next run (next deploy, expired cache entries) warms everything again
+            self.clear_progress(options['progress'])
+        self.report(counts, latencies, time.monotonic() - start, len(pending))
+
+    def collect_queries(self, options):
+        sources = set(filter(None, options['sources'].split(',')))
+        unknown = sources - set(SOURCES)
+        if unknown:
+            raise CommandError(f"Unknown sources: {', '.join(sorted(unknown))}")
+
+        queries = []
+        if 'lists' in sources:
+            for titles in snapshots.get_movie_lists().values():
+                queries.extend(titles)
+        if 'moods' in sources:
+            for titles in FALLBACK_MOOD_MOVIES.values():
+                queries.extend(titles)
+        if 'interactions' in sources and options['top_interactions']:
+            queries.extend(self.top_interaction_titles(options['top_interactions']))
+        for path in options['file']:
+            with open(path, encoding='utf-8') as f:
+                queries.extend(line.strip() for line in f)
+
+        # Keep first-seen order, dropping blanks and spelling variants of the same title
+        unique = {}
+        for query in queries:
+            if query and query.strip():
+                unique.setdefault(movie_cache.normalize_title(query) or query, query.strip())
+        return list(unique.values())
+
+    def top_interaction_titles(self, limit):
+        from supabase import create_client
+
+        # Row level security hides other users' interactions from the anon key
+        key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+        if not key:
+            self.stderr.write("Warning: SUPABASE_SERVICE_ROLE_KEY is not set; the anon key cannot read other users' interactions")
+            key = os.getenv('VITE_SUPABASE_ANON_KEY')
+
+        counts = Counter()
+        try:
+            client = create_client(os.getenv('VITE_SUPABASE_URL'), key)
+            offset = 0
+            while True:
+                page = client.table('user_movie_interactions') \
+                    .select('movie_title') \
+                    .range(offset, offset + PAGE_SIZE - 1) \
+                    .execute()
+                counts.update(row['movie_title'] for row in page.data if row.get('movie_title'))
+                offset += PAGE_SIZE
+                if len(page.data) < PAGE_SIZE:
+                    break
+        except Exception as e:
+            self.stderr.write(f"Skipping interaction titles: {e}")
+            return []
+
+        if not counts:
+            self.stderr.write("Warning: user_movie_interactions returned no titles; the interactions source is empty")
+        return [title for title, _ in counts.most_common(limit)]
+
+    def load_progress(self, path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                return set(json.load(f)['done'])
+        except (OSError, ValueError, KeyError):
+            return set()
+
+    def save_progress(self, path, done):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'done': sorted(done)}, f)
+        os.replace(tmp_path, path)
+
+    def clear_progress(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def report(self, counts, latencies, elapsed, attempted):
+        completed = sum(counts.values())
+        self.stdout.write(
+            f"Processed {completed}/{attempted} movies in {elapsed:.2f}s ({completed / elapsed if elapsed else 0:.1f}/s): "
+            f"{counts['fetched']} fetched, {counts['cached']} already cached, "
+            f"{counts['not_found']} not found, {counts['failed']} failed"
+        )
+        if latencies:
+            self.stdout.write(
+                f"OMDb latency: p50 {_percentile(latencies, 0.5) * 1000:.0f} ms, "
+                f"p95 {_percentile(latencies, 0.95) * 1000:.0f} ms, max {max(latencies) * 1000:.0f} ms"
+            )
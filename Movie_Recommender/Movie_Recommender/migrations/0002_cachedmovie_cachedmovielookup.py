@@ -0,0 +1,31 @@
+# Generated by Django 5.1.5 on 2026-10-17 09:12
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Movie_Recommender', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CachedMovie',
+            fields=[
+                ('imdb_id', models.CharField(max_length=20, primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=255)),
+                ('data', models.JSONField()),
+                ('fetched_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CachedMovieLookup',
+            fields=[
+                ('title_key', models.CharField(max_length=255, primary_key=True, serialize=False)),
+                ('imdb_id', models.CharField(blank=True, max_length=20)),
+                ('expires_at', models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.5 on 2026-10-17 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Movie_Recommender', '0002_cachedmovie_cachedmovielookup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogTitle',
+            fields=[
+                ('imdb_id', models.CharField(max_length=20, primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=255)),
+                ('year', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('votes', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -6,4 +6,33 @@ class Feedback(models.Model):
     name = models.CharField(max_length=100)
     email = models.EmailField()  # Ensure the field exists
     message = models.TextField()
-    created_at = models.DateTimeField(auto_now_add=True)
\ No newline at end of file
+    created_at = models.DateTimeField(auto_now_add=True)
+
+class CachedMovie(models.Model):
+    """
+    Durable tier of the OMDb metadata cache, keyed by imdbID.
+    """
+    imdb_id = models.CharField(max_length=20, primary_key=True)
+    title = models.CharField(max_length=255)
+    data = models.JSONField()
+    fetched_at = models.DateTimeField(default=now)
+
+
+class CachedMovieLookup(models.Model):
+    """
+    Maps a normalized title to an imdbID. An empty imdb_id records that OMDb had no match.
+    """
+    title_key = models.CharField(max_length=255, primary_key=True)
+    imdb_id = models.CharField(max_length=20, blank=True)
+    expires_at = models.DateTimeField()
+
+
+class CatalogTitle(models.Model):
+    """
+    Local movie catalog used for title canonicalization and typeahead.
+    Filled from OMDb responses and from imported datasets.
+    """
+    imdb_id = models.CharField(max_length=20, primary_key=True)
+    title = models.CharField(max_length=255)
+    year = models.PositiveSmallIntegerField(null=True, blank=True)
+    votes = models.PositiveIntegerField(default=0)
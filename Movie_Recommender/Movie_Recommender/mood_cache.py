@@ -0,0 +1,148 @@
+import asyncio
+import copy
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+MOOD_CACHE_TTL = int(os.getenv('MOOD_CACHE_TTL', '3600'))
+MOOD_CACHE_MAX_ENTRIES = int(os.getenv('MOOD_CACHE_MAX_ENTRIES', '500'))
+# Number of distinct result sets kept per mood and served in rotation
+MOOD_CACHE_VARIETY = int(os.getenv('MOOD_CACHE_VARIETY', '3'))
+# How long a request waits for an identical in-flight LLM call before giving up
+MOOD_CACHE_WAIT_TIMEOUT = float(os.getenv('MOOD_CACHE_WAIT_TIMEOUT', '30'))
+
+
+def normalize_mood(mood):
+    """
+    Fold case, punctuation and whitespace so equivalent mood strings share a key.
+    """
+    mood = re.sub(r'[^\w]+', ' ', mood.casefold())
+    return ' '.join(mood.split())
+
+
+class _InFlight:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+
+
+class MoodCache:
+    """
+    Bounded, TTL'd cache of recommendation lists keyed by normalized mood.
+
+    Each key keeps up to `variety` result sets. Until that many exist, a lookup
+    computes a fresh one; afterwards the stored sets are served in rotation.
+    Concurrent lookups for the same key share a single computation.
+    """
+
+    def __init__(self, max_entries=MOOD_CACHE_MAX_ENTRIES, ttl=MOOD_CACHE_TTL, variety=MOOD_CACHE_VARIETY):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.variety = max(1, variety)
+        self._entries = OrderedDict()
+        self._in_flight = {}
+        self._in_flight_async = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get_or_compute(self, key, compute):
+        """
+        Return a cached result for `key` or call `compute()`. Results of None are not cached.
+        """
+        with self._lock:
+            cached = self._next_cached(key)
+            if cached is not None:
+                self.hits += 1
+                return copy.deepcopy(cached)
+
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._in_flight[key] = _InFlight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.event.wait(MOOD_CACHE_WAIT_TIMEOUT)
+            return copy.deepcopy(flight.result)
+
+        try:
+            flight.result = compute()
+        finally:
+            with self._lock:
+                if flight.result is not None:
+                    self._store(key, flight.result)
+                del self._in_flight[key]
+            flight.event.set()
+
+        return copy.deepcopy(flight.result)
+
+    async def get_or_compute_async(self, key, compute):
+        """
+        get_or_compute for async callers; `compute()` returns an awaitable. Coalescing
+        is per event loop, the stored results are shared with sync callers.
+        """
+        with self._lock:
+            cached = self._next_cached(key)
+            if cached is not None:
+                self.hits += 1
+                return copy.deepcopy(cached)
+
+        flight = self._in_flight_async.get(key)
+        if flight is not None:
+            self.coalesced += 1
+            try:
+                result = await asyncio.wait_for(asyncio.shield(flight), MOOD_CACHE_WAIT_TIMEOUT)
+            except Exception:
+                result = None
+            return copy.deepcopy(result)
+
+        flight = self._in_flight_async[key] = asyncio.get_running_loop().create_future()
+        self.misses += 1
+        result = None
+        try:
+            result = await compute()
+        finally:
+            if result is not None:
+                with self._lock:
+                    self._store(key, result)
+            del self._in_flight_async[key]
+            flight.set_result(result)
+
+        return copy.deepcopy(result)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _next_cached(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry['expires_at'] <= time.time():
+            del self._entries[key]
+            return None
+        if len(entry['results']) < self.variety:
+            return None
+
+        self._entries.move_to_end(key)
+        result = entry['results'][entry['next']]
+        entry['next'] = (entry['next'] + 1) % len(entry['results'])
+        return result
+
+    def _store(self, key, result):
+        entry = self._entries.get(key)
+        if entry is None or entry['expires_at'] <= time.time():
+            entry = self._entries[key] = {'expires_at': time.time() + self.ttl, 'results': [], 'next': 0}
+        entry['results'] = (entry['results'] + [copy.deepcopy(result)])[-self.variety:]
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+mood_cache = MoodCache()
@@ -0,0 +1,110 @@
+import os
+import re
+import json
+import threading
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+
+from .mood_index import embed_text
+
+MOOD_TRAINING_FILE = Path(os.getenv('MOOD_TRAINING_FILE', settings.BASE_DIR / 'data' / 'mood_training.jsonl'))
+# Predictions below this probability are handed to the LLM instead
+MOOD_CLASSIFIER_THRESHOLD = float(os.getenv('MOOD_CLASSIFIER_THRESHOLD', '0.5'))
+
+# Strong single-word cues per category, added as dense features next to the hashed n-grams
+MOOD_LEXICON = {
+    'happy': 'happy joy joyful cheerful glad great good fun funny laugh smile upbeat amazing grateful carefree',
+    'sad': 'sad down blue depressed lonely heartbroken cry crying grief grieving upset gloomy hopeless miss empty',
+    'excited': 'excited pumped hyped energetic energy adrenaline action thrilled amped unstoppable wild',
+    'romantic': 'romantic romance love loving crush date partner girlfriend boyfriend wife husband valentines anniversary',
+    'adventurous': 'adventurous adventure explore quest journey epic treasure travel wanderlust daring bold brave',
+    'thoughtful': 'thoughtful contemplative think philosophical curious reflective deep smart cerebral introspective',
+    'nostalgic': 'nostalgic nostalgia childhood memories retro classic throwback sentimental old kid young',
+    'anxious': 'anxious anxiety stressed nervous tense worried worry scared fear panicky spooky horror creepy terrified',
+}
+LEXICON_SETS = {label: set(words.split()) for label, words in MOOD_LEXICON.items()}
+LEXICON_SCALE = 0.5
+
+
+class MoodClassifier:
+    """
+    Multinomial logistic regression over hashed n-grams plus lexicon counts.
+    """
+
+    def __init__(self, labels, weights, bias):
+        self.labels = labels
+        self.weights = weights
+        self.bias = bias
+
+    @staticmethod
+    def features(text):
+        words = re.findall(r'[a-z]+', text.lower())
+        lexicon = np.array([sum(word in LEXICON_SETS.get(label, ()) for word in words) for label in MOOD_LEXICON],
+                           dtype=np.float32)
+        return np.concatenate([embed_text(text), lexicon * LEXICON_SCALE])
+
+    @classmethod
+    def train(cls, examples, iterations=300, learning_rate=1.0, l2=1e-3):
+        """
+        Fit on (text, label) pairs with full-batch gradient descent.
+        """
+        labels = sorted({label for _, label in examples})
+        index = {label: i for i, label in enumerate(labels)}
+        x = np.vstack([cls.features(text) for text, _ in examples])
+        y = np.zeros((len(examples), len(labels)), dtype=np.float32)
+        y[np.arange(len(examples)), [index[label] for _, label in examples]] = 1
+
+        weights = np.zeros((x.shape[1], len(labels)), dtype=np.float32)
+        bias = np.zeros(len(labels), dtype=np.float32)
+        for _ in range(iterations):
+            probabilities = _softmax(x @ weights + bias)
+            gradient = probabilities - y
+            weights -= learning_rate * (x.T @ gradient / len(examples) + l2 * weights)
+            bias -= learning_rate * gradient.mean(axis=0)
+        return cls(labels, weights, bias)
+
+    def predict(self, text):
+        """
+        Return (label, confidence, {label: probability}).
+        """
+        probabilities = _softmax(self.features(text) @ self.weights + self.bias)
+        best = int(np.argmax(probabilities))
+        return self.labels[best], float(probabilities[best]), dict(zip(self.labels, probabilities.tolist()))
+
+
+def _softmax(logits):
+    logits = logits - logits.max(axis=-1, keepdims=True)
+    exp = np.exp(logits)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+def load_training_examples(path=MOOD_TRAINING_FILE):
+    with open(path, encoding='utf-8') as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    return [(row['text'], row['label']) for row in rows]
+
+
+_classifier = None
+_classifier_lock = threading.Lock()
+
+
+def get_classifier():
+    """
+    Train the classifier from the bundled dataset on first use (a few milliseconds).
+    """
+    global _classifier
+    if _classifier is None:
+        with _classifier_lock:
+            if _classifier is None:
+                _classifier = MoodClassifier.train(load_training_examples())
+    return _classifier
+
+
+def classify_mood(text):
+    """
+    Return (category, confidence) for a free-text mood.
+    """
+    label, confidence, _ = get_classifier().predict(text)
+    return label, confidence
@@ -0,0 +1,197 @@
+import os
+import re
+import zlib
+import threading
+import logging
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+MOOD_INDEX_PATH = Path(os.getenv('MOOD_INDEX_PATH', settings.BASE_DIR / 'models' / 'mood_index.npz'))
+MOOD_INDEX_DIMENSIONS = int(os.getenv('MOOD_INDEX_DIMENSIONS', '1024'))
+# Number of inverted lists searched per query
+MOOD_INDEX_NPROBE = int(os.getenv('MOOD_INDEX_NPROBE', '4'))
+
+# Vocabulary describing each mood, added to movie documents so that
+# free-text moods land near movies that suit them
+MOOD_DESCRIPTORS = {
+    'happy': 'happy joyful cheerful fun funny upbeat feel good light hearted comedy smile laugh uplifting',
+    'sad': 'sad down blue melancholic heartbroken lonely cry tearjerker grief loss emotional moving',
+    'excited': 'excited energetic pumped hyped thrilling action adrenaline fast explosive intense',
+    'romantic': 'romantic love loving in love date night romance relationship passion crush heart',
+    'adventurous': 'adventurous adventure explore journey quest epic treasure wild daring escape',
+    'thoughtful': 'thoughtful contemplative reflective curious philosophical mind bending deep smart cerebral',
+    'nostalgic': 'nostalgic sentimental childhood memories classic retro old times family comfort',
+    'scared': 'scared anxious tense nervous spooky horror creepy frightening suspense thriller dark',
+}
+
+# Genres imply moods even for movies not in any curated list
+GENRE_MOODS = {
+    'comedy': 'happy', 'animation': 'happy', 'family': 'nostalgic', 'musical': 'happy',
+    'drama': 'sad', 'action': 'excited', 'romance': 'romantic', 'adventure': 'adventurous',
+    'fantasy': 'adventurous', 'sci-fi': 'thoughtful', 'mystery': 'thoughtful',
+    'documentary': 'thoughtful', 'horror': 'scared', 'thriller': 'scared', 'crime': 'excited',
+    'war': 'sad', 'biography': 'thoughtful', 'history': 'nostalgic', 'western': 'adventurous',
+}
+
+
+def embed_text(text, dimensions=MOOD_INDEX_DIMENSIONS):
+    """
+    Signed feature hashing of word unigrams and character 3/4-grams into a unit float32 vector.
+    """
+    vector = np.zeros(dimensions, dtype=np.float32)
+    words = re.findall(r'[a-z0-9]+', text.lower())
+    features = list(words)
+    for word in words:
+        padded = f' {word} '
+        for n in (3, 4):
+            features.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+
+    for feature in features:
+        # crc32 is stable across processes, unlike hash()
+        digest = zlib.crc32(feature.encode('utf-8'))
+        vector[digest % dimensions] += 1.0 if digest & 0x80000000 else -1.0
+
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def _kmeans(vectors, clusters, iterations=10, seed=0):
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), clusters, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+        for c in range(clusters):
+            members = vectors[assignments == c]
+            if len(members):
+                centroid = members.sum(axis=0)
+                norm = np.linalg.norm(centroid)
+                centroids[c] = centroid / norm if norm else centroid
+    return centroids, np.argmax(vectors @ centroids.T, axis=1)
+
+
+class MoodIndex:
+    """
+    IVF-style approximate nearest-neighbour index over movie embeddings.
+    """
+
+    def __init__(self, titles, imdb_ids, vectors, centroids, assignments):
+        self.titles = list(titles)
+        self.imdb_ids = list(imdb_ids)
+        self.vectors = vectors
+        self.centroids = centroids
+        self.assignments = assignments
+        # Movies grouped by inverted list, so a probe is one slice
+        self.order = np.argsort(assignments, kind='stable')
+        self.offsets = np.searchsorted(assignments[self.order], np.arange(len(centroids) + 1))
+
+    @classmethod
+    def build(cls, documents):
+        """
+        documents: list of (title, imdb_id, text).
+        """
+        titles = [title for title, _, _ in documents]
+        imdb_ids = [imdb_id for _, imdb_id, _ in documents]
+        vectors = np.vstack([embed_text(text) for _, _, text in documents]).astype(np.float32)
+        clusters = max(1, min(len(documents), int(np.sqrt(len(documents)))))
+        centroids, assignments = _kmeans(vectors, clusters)
+        return cls(titles, imdb_ids, vectors, centroids.astype(np.float32), assignments.astype(np.int32))
+
+    def search(self, text, k=8, nprobe=MOOD_INDEX_NPROBE):
+        """
+        Return [(title, imdb_id, score)] for the k movies closest to the text.
+        """
+        query = embed_text(text, self.vectors.shape[1])
+        lists = np.argsort(-(self.centroids @ query))[:nprobe]
+        candidates = np.concatenate([self.order[self.offsets[c]:self.offsets[c + 1]] for c in lists])
+        if not len(candidates):
+            return []
+
+        scores = self.vectors[candidates] @ query
+        k = min(k, len(candidates))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.titles[candidates[i]], self.imdb_ids[candidates[i]], float(scores[i])) for i in top if scores[i] > 0]
+
+    def save(self, path=MOOD_INDEX_PATH):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.stem + '.tmp.npz')
+        np.savez(tmp_path, titles=np.array(self.titles, dtype=object), imdb_ids=np.array(self.imdb_ids, dtype=object),
+                 vectors=self.vectors, centroids=self.centroids, assignments=self.assignments)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=MOOD_INDEX_PATH):
+        with np.load(path, allow_pickle=True) as data:
+            return cls(data['titles'].tolist(), data['imdb_ids'].tolist(), data['vectors'],
+                       data['centroids'], data['assignments'])
+
+
+def movie_documents():
+    """
+    Build (title, imdb_id, text) documents from cached OMDb metadata and the curated mood lists.
+    """
+    from .models import CachedMovie
+    from .movie_cache import normalize_title
+    from .utils import FALLBACK_MOOD_MOVIES
+
+    curated = {}
+    for mood, titles in FALLBACK_MOOD_MOVIES.items():
+        for title in titles:
+            curated.setdefault(normalize_title(title), (title, []))[1].append(mood)
+
+    documents = {}
+    for movie in CachedMovie.objects.all().only('data'):
+        data = movie.data
+        key = normalize_title(data.get('Title', ''))
+        genres = [genre.strip().lower() for genre in data.get('Genre', '').split(',')]
+        moods = {GENRE_MOODS[genre] for genre in genres if genre in GENRE_MOODS}
+        moods.update(curated.get(key, ('', []))[1])
+        text = ' '.join([data.get('Title', ''), data.get('Genre', ''), data.get('Plot', '')] +
+                        [MOOD_DESCRIPTORS[mood] for mood in moods])
+        documents[key] = (data.get('Title', ''), data.get('imdbID', ''), text)
+
+    # Curated picks are indexed even before their metadata has been cached
+    for key, (title, moods) in curated.items():
+        if key not in documents:
+            documents[key] = (title, '', ' '.join([title] + [MOOD_DESCRIPTORS[mood] for mood in moods]))
+
+    return list(documents.values())
+
+
+_index = {'mtime': None, 'index': None}
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """
+    Return the mood index, reloading it after a rebuild. None if it has not been built.
+    """
+    try:
+        mtime = MOOD_INDEX_PATH.stat().st_mtime
+    except OSError:
+        return None
+
+    if mtime != _index['mtime']:
+        with _index_lock:
+            if mtime != _index['mtime']:
+                try:
+                    _index['index'] = MoodIndex.load(MOOD_INDEX_PATH)
+                    _index['mtime'] = mtime
+                except Exception as e:
+                    logger.warning(f"Could not load mood index: {e}")
+    return _index['index']
+
+
+def search_movies_for_mood(mood, k=8):
+    """
+    Titles of the movies nearest to a free-text mood, or [] when no index has been built.
+    """
+    index = get_index()
+    if index is None:
+        return []
+    return [title for title, _, _ in index.search(mood, k)]
@@ -0,0 +1,264 @@
+import os
+import re
+import threading
+import time
+import logging
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.db import DatabaseError
+from django.utils import timezone
+
+from .models import CachedMovie, CachedMovieLookup
+
+logger = logging.getLogger(__name__)
+
+# Movie metadata rarely changes, so positive entries live for a week by default
+MOVIE_CACHE_TTL = int(os.getenv('MOVIE_CACHE_TTL', str(7 * 24 * 3600)))
+MOVIE_CACHE_NEGATIVE_TTL = int(os.getenv('MOVIE_CACHE_NEGATIVE_TTL', '3600'))
+MOVIE_CACHE_MAX_ENTRIES = int(os.getenv('MOVIE_CACHE_MAX_ENTRIES', '2000'))
+
+# Returned by lookups when OMDb is known not to have the movie
+NOT_FOUND = object()
+
+# OMDb errors that mean "no such movie" (as opposed to quota or key problems)
+NOT_FOUND_ERRORS = ('movie not found!', 'incorrect imdb id.')
+
+
+class LRUCache:
+    """
+    Small thread-safe LRU mapping with per-entry expiry.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+memory_cache = LRUCache(MOVIE_CACHE_MAX_ENTRIES)
+
+_stats = {'memory_hits': 0, 'durable_hits': 0, 'negative_hits': 0, 'misses': 0}
+_stats_lock = threading.Lock()
+
+
+def _record(counter):
+    with _stats_lock:
+        _stats[counter] += 1
+
+
+def get_cache_stats():
+    """
+    Return hit/miss counters for the movie metadata cache.
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    stats['memory_entries'] = len(memory_cache)
+    return stats
+
+
+def normalize_title(title):
+    """
+    Fold case, punctuation and whitespace so near-identical titles share a cache key.
+    """
+    title = re.sub(r'[^\w]+', ' ', title.casefold())
+    return ' '.join(title.split())
+
+
+def is_not_found(data):
+    """
+    True when an OMDb payload says the movie does not exist.
+    """
+    return data.get('Response') != 'True' and data.get('Error', '').lower() in NOT_FOUND_ERRORS
+
+
+def title_lookup_key(title, year=None):
+    """
+    Durable lookup key for a title, optionally narrowed to a release year.
+    """
+    key = normalize_title(title)
+    return f'{key} ({year})' if year else key
+
+
+def _title_key(title, year=None):
+    return f'title:{title_lookup_key(title, year)}'
+
+
+def _imdb_key(imdb_id):
+    return f'imdb:{imdb_id}'
+
+
+def _lookup_memory(key):
+    value = memory_cache.get(key)
+    if value is not None:
+        _record('negative_hits' if value is NOT_FOUND else 'memory_hits')
+    return value
+
+
+def lookup_imdb_id_in_memory(imdb_id):
+    """
+    lookup_imdb_id without the database tier, for callers that must not block (async views).
+    """
+    return _lookup_memory(_imdb_key(imdb_id))
+
+
+def lookup_title_in_memory(title, year=None):
+    """
+    lookup_title without the database tier, for callers that must not block (async views).
+    """
+    return _lookup_memory(_title_key(title, year))
+
+
+def lookup_imdb_id(imdb_id):
+    """
+    Return the cached OMDb payload for an imdbID, NOT_FOUND for a cached miss, or None.
+    """
+    key = _imdb_key(imdb_id)
+    value = _lookup_memory(key)
+    if value is not None:
+        return value
+
+    try:
+        movie = CachedMovie.objects.filter(imdb_id=imdb_id).first()
+    except DatabaseError as e:
+        logger.warning(f"Movie cache durable lookup failed: {e}")
+        movie = None
+
+    if movie is not None:
+        age = (timezone.now() - movie.fetched_at).total_seconds()
+        if age < MOVIE_CACHE_TTL:
+            memory_cache.set(key, movie.data, MOVIE_CACHE_TTL - age)
+            _record('durable_hits')
+            return movie.data
+
+    _record('misses')
+    return None
+
+
+def lookup_title(title, year=None):
+    """
+    Return the cached OMDb payload for a title, NOT_FOUND for a cached miss, or None.
+    """
+    key = _title_key(title, year)
+    value = _lookup_memory(key)
+    if value is not None:
+        return value
+
+    try:
+        lookup = CachedMovieLookup.objects.filter(title_key=title_lookup_key(title, year), expires_at__gt=timezone.now()).first()
+    except DatabaseError as e:
+        logger.warning(f"Movie cache durable lookup failed: {e}")
+        lookup = None
+
+    if lookup is not None:
+        ttl = (lookup.expires_at - timezone.now()).total_seconds()
+        if not lookup.imdb_id:
+            memory_cache.set(key, NOT_FOUND, ttl)
+            _record('negative_hits')
+            return NOT_FOUND
+
+        data = lookup_imdb_id(lookup.imdb_id)
+        if data is not None and data is not NOT_FOUND:
+            memory_cache.set(key, data, ttl)
+            return data
+        return None
+
+    _record('misses')
+    return None
+
+
+def store(data, title=None, year=None):
+    """
+    Cache a successful OMDb payload under its imdbID, its title and the requested title.
+    """
+    imdb_id = data.get('imdbID')
+    if not imdb_id:
+        return
+
+    titles = {title_lookup_key(t) for t in (title, data.get('Title')) if t}
+    if title and year:
+        titles.add(title_lookup_key(title, year))
+    expires_at = timezone.now() + timedelta(seconds=MOVIE_CACHE_TTL)
+
+    memory_cache.set(_imdb_key(imdb_id), data, MOVIE_CACHE_TTL)
+    for title_key in titles:
+        memory_cache.set(f'title:{title_key}', data, MOVIE_CACHE_TTL)
+
+    try:
+        CachedMovie.objects.update_or_create(
+            imdb_id=imdb_id,
+            defaults={'title': data.get('Title', ''), 'data': data, 'fetched_at': timezone.now()}
+        )
+        for title_key in titles:
+            CachedMovieLookup.objects.update_or_create(
+                title_key=title_key,
+                defaults={'imdb_id': imdb_id, 'expires_at': expires_at}
+            )
+    except DatabaseError as e:
+        logger.warning(f"Movie cache durable write failed: {e}")
+
+    # Every movie OMDb has described becomes resolvable through the local catalog
+    from .catalog import record_movie
+    record_movie(data)
+
+    # Precompute the streaming links so rendering and the details API never build URLs
+    from .streaming_links import store_links
+    store_links(data.get('Title', ''), imdb_id)
+
+
+def store_alias(title, data, year=None):
+    """
+    Point another spelling of a title at an already cached payload.
+    """
+    memory_cache.set(_title_key(title, year), data, MOVIE_CACHE_TTL)
+    try:
+        CachedMovieLookup.objects.update_or_create(
+            title_key=title_lookup_key(title, year),
+            defaults={'imdb_id': data['imdbID'], 'expires_at': timezone.now() + timedelta(seconds=MOVIE_CACHE_TTL)}
+        )
+    except DatabaseError as e:
+        logger.warning(f"Movie cache durable write failed: {e}")
+
+
+def store_not_found(title=None, imdb_id=None, year=None):
+    """
+    Negatively cache a title or imdbID that OMDb does not know about.
+    """
+    if imdb_id:
+        memory_cache.set(_imdb_key(imdb_id), NOT_FOUND, MOVIE_CACHE_NEGATIVE_TTL)
+
+    if title:
+        memory_cache.set(_title_key(title, year), NOT_FOUND, MOVIE_CACHE_NEGATIVE_TTL)
+        try:
+            CachedMovieLookup.objects.update_or_create(
+                title_key=title_lookup_key(title, year),
+                defaults={'imdb_id': '', 'expires_at': timezone.now() + timedelta(seconds=MOVIE_CACHE_NEGATIVE_TTL)}
+            )
+        except DatabaseError as e:
+            logger.warning(f"Movie cache durable write failed: {e}")
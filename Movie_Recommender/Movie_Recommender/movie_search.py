@@ -0,0 +1,66 @@
+import os
+import re
+
+from . import omdb_client
+from .mood_cache import MoodCache
+from .rate_limit import TokenBucketLimiter
+
+# Search results change slowly; one shared copy serves every browser for this long
+SEARCH_CACHE_TTL = int(os.getenv('SEARCH_CACHE_TTL', '3600'))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv('SEARCH_CACHE_MAX_ENTRIES', '2000'))
+SEARCH_BROWSER_MAX_AGE = int(os.getenv('SEARCH_BROWSER_MAX_AGE', '300'))
+
+# Per-client budget for searches that miss the cache and reach OMDb
+SEARCH_RATE_PER_SECOND = float(os.getenv('SEARCH_RATE_PER_SECOND', '1'))
+SEARCH_RATE_BURST = int(os.getenv('SEARCH_RATE_BURST', '5'))
+
+SEARCH_MAX_PAGE = 100
+SEARCH_MIN_QUERY_LENGTH = 2
+
+# OMDb answers that are a valid (empty) result rather than a failure, and can be cached
+CACHEABLE_SEARCH_ERRORS = ('movie not found!', 'too many results.')
+
+# A single-result-set MoodCache is a TTL'd LRU that coalesces identical concurrent lookups
+search_cache = MoodCache(max_entries=SEARCH_CACHE_MAX_ENTRIES, ttl=SEARCH_CACHE_TTL, variety=1)
+search_limiter = TokenBucketLimiter(SEARCH_RATE_PER_SECOND, SEARCH_RATE_BURST)
+
+
+class SearchRateLimited(Exception):
+    """
+    Raised when a client exceeds its budget of uncached searches.
+    """
+
+    def __init__(self, retry_after):
+        super().__init__(f'Retry after {retry_after:.1f}s')
+        self.retry_after = retry_after
+
+
+def normalize_query(query):
+    """
+    Fold case and whitespace so 'Star  Wars' and 'star wars' share a cache entry.
+    """
+    return ' '.join(re.sub(r'[^\w\s:\'&-]+', ' ', query.casefold()).split())
+
+
+def search(query, page=1, client_id=None):
+    """
+    Return the OMDb search payload for a normalized query and page, from the shared cache
+    when possible. Raises SearchRateLimited when the client's budget for cache misses is spent
+    and OMDbUnavailable when OMDb cannot answer.
+    """
+    def compute():
+        retry_after = search_limiter.acquire(client_id)
+        if retry_after:
+            raise SearchRateLimited(retry_after)
+
+        data = omdb_client.search_movies(query, page)
+        if data.get('Response') == 'True' or str(data.get('Error', '')).lower() in CACHEABLE_SEARCH_ERRORS:
+            return data
+        # Quota or key errors must not be cached
+        raise omdb_client.OMDbUnavailable(data.get('Error', 'Unexpected OMDb response'))
+
+    result = search_cache.get_or_compute(f'{query}|{page}', compute)
+    if result is None:
+        # Requests that waited on a failed identical lookup
+        raise omdb_client.OMDbUnavailable('Search failed')
+    return result
@@ -0,0 +1,218 @@
+import os
+import asyncio
+import threading
+import time
+import logging
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .instrumentation import span
+
+logger = logging.getLogger(__name__)
+
+OMDB_BASE_URL = os.getenv('OMDB_BASE_URL', 'http://www.omdbapi.com/')
+OMDB_POOL_SIZE = int(os.getenv('OMDB_POOL_SIZE', '10'))
+OMDB_CONNECT_TIMEOUT = float(os.getenv('OMDB_CONNECT_TIMEOUT', '2'))
+OMDB_READ_TIMEOUT = float(os.getenv('OMDB_READ_TIMEOUT', '5'))
+OMDB_MAX_RETRIES = int(os.getenv('OMDB_MAX_RETRIES', '2'))
+OMDB_BACKOFF_FACTOR = float(os.getenv('OMDB_BACKOFF_FACTOR', '0.3'))
+# Connection limit of the AsyncClient used by the async views
+OMDB_ASYNC_MAX_CONNECTIONS = int(os.getenv('OMDB_ASYNC_MAX_CONNECTIONS', '20'))
+
+# Circuit breaker: open after this many consecutive failures, retry after the cooldown
+OMDB_BREAKER_THRESHOLD = int(os.getenv('OMDB_BREAKER_THRESHOLD', '5'))
+OMDB_BREAKER_COOLDOWN = float(os.getenv('OMDB_BREAKER_COOLDOWN', '30'))
+
+
+class OMDbUnavailable(Exception):
+    """
+    Raised when OMDb cannot be reached or the circuit breaker is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker. While open, calls are refused until the
+    cooldown passes, then a single trial call decides whether to close again.
+    """
+
+    def __init__(self, threshold, cooldown):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.cooldown or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._failures >= self.threshold:
+                if self._opened_at is None:
+                    logger.warning("OMDb circuit breaker opened")
+                self._opened_at = time.monotonic()
+
+    def release_trial(self):
+        """
+        Give up a half-open trial that ended without an answer (e.g. it was cancelled),
+        so the next call can probe OMDb again.
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    @property
+    def is_open(self):
+        return self._opened_at is not None
+
+
+def _build_session():
+    """
+    Create a keep-alive session with a sized connection pool and bounded retries.
+    """
+    retry = Retry(
+        total=OMDB_MAX_RETRIES,
+        backoff_factor=OMDB_BACKOFF_FACTOR,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET']),
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=OMDB_POOL_SIZE, max_retries=retry)
+
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+session = _build_session()
+breaker = CircuitBreaker(OMDB_BREAKER_THRESHOLD, OMDB_BREAKER_COOLDOWN)
+
+
+def get_movie(title=None, imdb_id=None, year=None, plot='full'):
+    """
+    Fetch a single movie from OMDb by title or imdbID and return the raw JSON payload.
+    """
+    return _get(_movie_params(title, imdb_id, year, plot))
+
+
+def search_movies(query, page=1):
+    """
+    Run an OMDb title search (s=) and return the raw JSON payload.
+    """
+    return _get({'apikey': os.getenv('OMDB_API_KEY'), 's': query, 'page': page})
+
+
+async def get_movie_async(title=None, imdb_id=None, year=None, plot='full'):
+    """
+    Awaitable get_movie for async views; shares the circuit breaker with the sync client.
+    """
+    return await _get_async(_movie_params(title, imdb_id, year, plot))
+
+
+def _movie_params(title, imdb_id, year, plot):
+    params = {'apikey': os.getenv('OMDB_API_KEY'), 'plot': plot}
+    if imdb_id:
+        params['i'] = imdb_id
+    else:
+        params['t'] = title
+        if year:
+            params['y'] = year
+    return params
+
+
+@span('omdb')
+def _get(params):
+    if not breaker.allow():
+        raise OMDbUnavailable('OMDb circuit breaker is open')
+
+    try:
+        response = session.get(OMDB_BASE_URL, params=params, timeout=(OMDB_CONNECT_TIMEOUT, OMDB_READ_TIMEOUT))
+        response.raise_for_status()
+        data = response.json()
+    except (requests.RequestException, ValueError) as e:
+        breaker.record_failure()
+        raise OMDbUnavailable(str(e)) from e
+    except BaseException:
+        breaker.release_trial()
+        raise
+
+    breaker.record_success()
+    return data
+
+
+_async_clients = {}
+
+
+def _get_async_client():
+    """
+    One AsyncClient per event loop; a client cannot be shared across loops.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        import httpx
+
+        client = _async_clients[loop] = httpx.AsyncClient(
+            timeout=httpx.Timeout(OMDB_READ_TIMEOUT, connect=OMDB_CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_connections=OMDB_ASYNC_MAX_CONNECTIONS,
+                                max_keepalive_connections=OMDB_POOL_SIZE),
+        )
+    return client
+
+
+@span('omdb')
+async def _get_async(params):
+    if not breaker.allow():
+        raise OMDbUnavailable('OMDb circuit breaker is open')
+
+    try:
+        data = await _request_async(params)
+    except OMDbUnavailable:
+        breaker.record_failure()
+        raise
+    except BaseException:
+        # Cancelled by a wait_for deadline or a disconnected client before OMDb answered
+        breaker.release_trial()
+        raise
+
+    breaker.record_success()
+    return data
+
+
+async def _request_async(params):
+    # Only async views need httpx; sync workers and management commands never import it
+    import httpx
+
+    client = _get_async_client()
+    for attempt in range(OMDB_MAX_RETRIES + 1):
+        try:
+            response = await client.get(OMDB_BASE_URL, params=params)
+            if response.status_code in (429, 500, 502, 503, 504) and attempt < OMDB_MAX_RETRIES:
+                await asyncio.sleep(OMDB_BACKOFF_FACTOR * (2 ** attempt))
+                continue
+            response.raise_for_status()
+            return response.json()
+        except httpx.TransportError as e:
+            if attempt < OMDB_MAX_RETRIES:
+                await asyncio.sleep(OMDB_BACKOFF_FACTOR * (2 ** attempt))
+                continue
+            raise OMDbUnavailable(str(e)) from e
+        except (httpx.HTTPError, ValueError) as e:
+            raise OMDbUnavailable(str(e)) from e
@@ -0,0 +1,35 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TokenBucketLimiter:
+    """
+    Per-key token buckets: each key may spend `burst` tokens at once and regains
+    `rate` tokens per second. Idle keys beyond `max_keys` are forgotten.
+    """
+
+    def __init__(self, rate, burst, max_keys=10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key, cost=1):
+        """
+        Spend `cost` tokens for `key`. Returns 0 when allowed, otherwise the seconds until enough tokens
+        are available. A cost above `burst` is never allowed.
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+
+        return 0 if allowed else (cost - tokens) / self.rate
@@ -0,0 +1,154 @@
+import os
+import threading
+import logging
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+from django.conf import settings
+
+from .movie_cache import normalize_title
+
+logger = logging.getLogger(__name__)
+
+RECOMMENDER_MODEL_PATH = Path(os.getenv('RECOMMENDER_MODEL_PATH', settings.BASE_DIR / 'models' / 'item_similarity.npz'))
+RECOMMENDER_TOP_K = int(os.getenv('RECOMMENDER_TOP_K', '50'))
+
+# How strongly each interaction signals a preference
+INTERACTION_WEIGHTS = {'viewed': 1.0, 'watchlist': 2.0, 'liked': 3.0}
+
+
+class ItemSimilarityModel:
+    """
+    Precomputed top-K item-item cosine neighbours over user interactions.
+    """
+
+    def __init__(self, titles, neighbors, scores):
+        self.titles = list(titles)
+        self.neighbors = neighbors
+        self.scores = scores
+        self.index = {normalize_title(title): i for i, title in enumerate(self.titles)}
+
+    def recommend(self, interactions, n=8):
+        """
+        Score unseen items by their similarity to the user's weighted interactions.
+        """
+        user_weights = _aggregate_weights(
+            (normalize_title(row['movie_title']), row['interaction_type']) for row in interactions
+        )
+        seen = [self.index[key] for key in user_weights if key in self.index]
+        if not seen:
+            return []
+
+        scores = np.zeros(len(self.titles), dtype=np.float32)
+        for item in seen:
+            np.add.at(scores, self.neighbors[item], self.scores[item] * user_weights[normalize_title(self.titles[item])])
+        scores[seen] = 0
+
+        candidates = np.flatnonzero(scores > 0)
+        if not len(candidates):
+            return []
+        top = candidates[np.argsort(-scores[candidates], kind='stable')[:n]]
+        return [self.titles[i] for i in top]
+
+    def save(self, path=RECOMMENDER_MODEL_PATH):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.stem + '.tmp.npz')
+        np.savez_compressed(tmp_path, titles=np.array(self.titles, dtype=object), neighbors=self.neighbors, scores=self.scores)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=RECOMMENDER_MODEL_PATH):
+        with np.load(path, allow_pickle=True) as data:
+            return cls(data['titles'].tolist(), data['neighbors'], data['scores'])
+
+
+def _aggregate_weights(pairs):
+    weights = {}
+    for key, interaction_type in pairs:
+        weights[key] = weights.get(key, 0.0) + INTERACTION_WEIGHTS.get(interaction_type, 0.0)
+    return weights
+
+
+def train(rows, top_k=RECOMMENDER_TOP_K):
+    """
+    Build an ItemSimilarityModel from user_movie_interactions rows.
+    """
+    users = {}
+    items = {}
+    titles = []
+    cells = {}
+    for row in rows:
+        key = normalize_title(row['movie_title'])
+        if not key:
+            continue
+        user = users.setdefault(row['user_id'], len(users))
+        if key not in items:
+            items[key] = len(titles)
+            titles.append(row['movie_title'])
+        cell = (user, items[key])
+        cells[cell] = cells.get(cell, 0.0) + INTERACTION_WEIGHTS.get(row['interaction_type'], 0.0)
+
+    n_items = len(titles)
+    k = min(top_k, max(n_items - 1, 0))
+    if not cells or k == 0:
+        return ItemSimilarityModel(titles, np.zeros((n_items, 0), dtype=np.int32), np.zeros((n_items, 0), dtype=np.float32))
+
+    (user_idx, item_idx), values = zip(*cells.keys()), list(cells.values())
+    matrix = sparse.csr_matrix((np.array(values, dtype=np.float32), (user_idx, item_idx)), shape=(len(users), n_items))
+
+    # Cosine similarity between item columns
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=0)).ravel())
+    norms[norms == 0] = 1
+    matrix = matrix.multiply(1 / norms).tocsc()
+    similarity = (matrix.T @ matrix).tocsr()
+    similarity.setdiag(0)
+    similarity.eliminate_zeros()
+
+    neighbors = np.zeros((n_items, k), dtype=np.int32)
+    scores = np.zeros((n_items, k), dtype=np.float32)
+    for item in range(n_items):
+        start, end = similarity.indptr[item], similarity.indptr[item + 1]
+        cols, sims = similarity.indices[start:end], similarity.data[start:end]
+        if len(cols) > k:
+            top = np.argpartition(-sims, k - 1)[:k]
+            cols, sims = cols[top], sims[top]
+        neighbors[item, :len(cols)] = cols
+        scores[item, :len(cols)] = sims
+
+    return ItemSimilarityModel(titles, neighbors, scores)
+
+
+_model = {'mtime': None, 'model': None}
+_model_lock = threading.Lock()
+
+
+def get_model():
+    """
+    Return the trained model, reloading it when the file on disk changes. None if untrained.
+    """
+    try:
+        mtime = RECOMMENDER_MODEL_PATH.stat().st_mtime
+    except OSError:
+        return None
+
+    if mtime != _model['mtime']:
+        with _model_lock:
+            if mtime != _model['mtime']:
+                try:
+                    _model['model'] = ItemSimilarityModel.load(RECOMMENDER_MODEL_PATH)
+                    _model['mtime'] = mtime
+                except Exception as e:
+                    logger.warning(f"Could not load recommender model: {e}")
+    return _model['model']
+
+
+def recommend_for_user(interactions, n=8):
+    """
+    Collaborative-filtering recommendations for a user's interactions, or [] on cold start.
+    """
+    model = get_model()
+    if model is None:
+        return []
+    return model.recommend(interactions, n)
@@ -0,0 +1,105 @@
+import os
+import json
+import hashlib
+import threading
+import logging
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Title lists for the trending/recent tabs live in a data file, not in code
+MOVIE_LISTS_FILE = Path(os.getenv('MOVIE_LISTS_FILE', settings.BASE_DIR / 'data' / 'movie_lists.json'))
+# Rendered snapshots are written here so every worker process can serve them
+SNAPSHOT_DIR = Path(os.getenv('MOVIE_SNAPSHOT_DIR', settings.BASE_DIR / 'snapshots'))
+
+_lists = {'mtime': None, 'data': {}}
+_snapshots = {}
+_lock = threading.Lock()
+
+
+def get_movie_lists():
+    """
+    Return the configured title lists, reloading the data file when it changes.
+    """
+    try:
+        mtime = MOVIE_LISTS_FILE.stat().st_mtime
+    except OSError as e:
+        logger.warning(f"Movie lists file unavailable: {e}")
+        return _lists['data']
+
+    if mtime != _lists['mtime']:
+        with _lock:
+            with open(MOVIE_LISTS_FILE, encoding='utf-8') as f:
+                _lists['data'] = json.load(f)
+            _lists['mtime'] = mtime
+    return _lists['data']
+
+
+def get_movie_list(name):
+    """
+    Return the titles configured for a list such as 'trending' or 'recent'.
+    """
+    return get_movie_lists().get(name, [])
+
+
+def _snapshot_path(name):
+    return SNAPSHOT_DIR / f'{name}.json'
+
+
+def refresh_snapshot(name):
+    """
+    Render the cards for a list, write the snapshot to disk and return it.
+    """
+    from .views import render_enhanced_movie_cards
+
+    titles = get_movie_list(name)
+    html = render_enhanced_movie_cards(titles).decode('utf-8')
+    snapshot = {
+        'name': name,
+        'titles': titles,
+        'html': html,
+        'etag': '"%s"' % hashlib.sha1(html.encode('utf-8')).hexdigest(),
+        'generated_at': timezone.now().isoformat(),
+    }
+
+    SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+    path = _snapshot_path(name)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f)
+    # Atomic rename so readers never see a half-written snapshot
+    os.replace(tmp_path, path)
+
+    with _lock:
+        _snapshots[name] = (path.stat().st_mtime, snapshot)
+    return snapshot
+
+
+def get_snapshot(name):
+    """
+    Return the latest snapshot for a list, or None if it has never been rendered.
+    The in-memory copy is reused until the file on disk changes.
+    """
+    path = _snapshot_path(name)
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        return None
+
+    cached = _snapshots.get(name)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    try:
+        with open(path, encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not load snapshot {name}: {e}")
+        return None
+
+    with _lock:
+        _snapshots[name] = (mtime, snapshot)
+    return snapshot
@@ -0,0 +1,86 @@
+import os
+import json
+import threading
+from pathlib import Path
+from urllib.parse import quote, quote_plus
+
+from django.conf import settings
+
+from .movie_cache import LRUCache, MOVIE_CACHE_MAX_ENTRIES, MOVIE_CACHE_TTL
+
+STREAMING_PLATFORMS_FILE = Path(os.getenv('STREAMING_PLATFORMS_FILE', settings.BASE_DIR / 'data' / 'streaming_platforms.json'))
+
+# 'percent' encodes spaces as %20 (paths and most search pages), 'plus' as + (form-style queries)
+QUOTERS = {
+    'percent': lambda title: quote(title, safe=''),
+    'plus': lambda title: quote_plus(title),
+}
+
+# Link sets are stored next to the cached movie metadata, under the same imdbIDs
+link_cache = LRUCache(MOVIE_CACHE_MAX_ENTRIES)
+
+_registry = {'platforms': None}
+_registry_lock = threading.Lock()
+
+
+class Platform:
+    """
+    A streaming platform with its URL templates split around the placeholder,
+    so building a link is one concatenation.
+    """
+
+    def __init__(self, name, url, color, quote='percent', imdb_url=None):
+        self.name = name
+        self.color = color
+        self.quote = QUOTERS[quote]
+        self.prefix, _, self.suffix = url.partition('{title}')
+        self.imdb_prefix, _, self.imdb_suffix = (imdb_url or '').partition('{imdb_id}')
+        self.links_by_id = bool(imdb_url)
+
+    def link(self, quoted_titles, imdb_id):
+        if imdb_id and self.links_by_id:
+            url = self.imdb_prefix + quote(imdb_id, safe='') + self.imdb_suffix
+        else:
+            url = self.prefix + quoted_titles[self.quote] + self.suffix
+        return {'name': self.name, 'url': url, 'color': self.color}
+
+
+def get_platforms():
+    """
+    The platform registry, loaded from STREAMING_PLATFORMS_FILE once per process.
+    """
+    if _registry['platforms'] is None:
+        with _registry_lock:
+            if _registry['platforms'] is None:
+                with open(STREAMING_PLATFORMS_FILE, encoding='utf-8') as f:
+                    _registry['platforms'] = [Platform(**platform) for platform in json.load(f)]
+    return _registry['platforms']
+
+
+def build_links(title, imdb_id=''):
+    """
+    Build the link set for a movie, quoting the title once per quoting style.
+    """
+    platforms = get_platforms()
+    quoted_titles = {quoter: quoter(title) for quoter in {platform.quote for platform in platforms}}
+    return [platform.link(quoted_titles, imdb_id) for platform in platforms]
+
+
+def get_links(title, imdb_id=''):
+    """
+    Return the link set for a movie, precomputed when its metadata was cached.
+    The returned list is shared; callers must not modify it.
+    """
+    if not imdb_id:
+        return build_links(title)
+
+    links = link_cache.get(imdb_id)
+    if links is None:
+        links = store_links(title, imdb_id)
+    return links
+
+
+def store_links(title, imdb_id):
+    links = build_links(title, imdb_id)
+    link_cache.set(imdb_id, links, MOVIE_CACHE_TTL)
+    return links
@@ -0,0 +1,182 @@
+import os
+import json
+import hashlib
+import threading
+import time
+import logging
+from collections import OrderedDict
+from functools import wraps
+
+import jwt
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.http import JsonResponse
+
+from .instrumentation import span
+from .supabase_client import supabase
+
+logger = logging.getLogger(__name__)
+
+# Local verification: HS256 project secret and/or a JWKS file for asymmetric signing keys
+SUPABASE_JWT_SECRET = os.getenv('SUPABASE_JWT_SECRET')
+SUPABASE_JWKS_FILE = os.getenv('SUPABASE_JWKS_FILE')
+SUPABASE_JWT_AUDIENCE = os.getenv('SUPABASE_JWT_AUDIENCE', 'authenticated')
+ASYMMETRIC_ALGORITHMS = ['RS256', 'ES256']
+
+# Resolved users are cached for at most this long, and never past the token's expiry
+AUTH_CACHE_TTL = int(os.getenv('AUTH_CACHE_TTL', '300'))
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv('AUTH_CACHE_MAX_ENTRIES', '10000'))
+
+
+class SupabaseUser:
+    """
+    Minimal view of an authenticated Supabase user, built from verified token claims.
+    """
+
+    def __init__(self, id, email=None, claims=None):
+        self.id = id
+        self.email = email
+        self.claims = claims or {}
+
+    def __repr__(self):
+        return f'SupabaseUser({self.id!r})'
+
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_jwks = None
+
+
+def get_bearer_token(request):
+    """
+    Return the Bearer token from the Authorization header, or None.
+    """
+    auth_header = request.headers.get('Authorization')
+    if not auth_header:
+        return None
+    return auth_header.replace('Bearer ', '').strip() or None
+
+
+def _load_jwks():
+    global _jwks
+    if _jwks is None and SUPABASE_JWKS_FILE:
+        with open(SUPABASE_JWKS_FILE, encoding='utf-8') as f:
+            _jwks = jwt.PyJWKSet.from_dict(json.load(f))
+    return _jwks
+
+
+def _decode_locally(token):
+    """
+    Verify signature, expiry and audience without a network call.
+    Returns the claims, or None when no local key material is configured.
+    """
+    header = jwt.get_unverified_header(token)
+    algorithm = header.get('alg')
+
+    if algorithm == 'HS256' and SUPABASE_JWT_SECRET:
+        return jwt.decode(token, SUPABASE_JWT_SECRET, algorithms=['HS256'], audience=SUPABASE_JWT_AUDIENCE)
+
+    jwks = _load_jwks()
+    if algorithm in ASYMMETRIC_ALGORITHMS and jwks is not None:
+        for key in jwks.keys:
+            if key.key_id == header.get('kid'):
+                return jwt.decode(token, key.key, algorithms=[algorithm], audience=SUPABASE_JWT_AUDIENCE)
+        raise jwt.InvalidTokenError('Unknown signing key')
+
+    return None
+
+
+def _verify_remotely(token):
+    """
+    Fall back to a Supabase round-trip when the token cannot be verified locally.
+    """
+    with span('supabase'):
+        user_response = supabase.auth.get_user(token)
+    if not user_response.user:
+        return None
+    claims = jwt.decode(token, options={'verify_signature': False})
+    claims.setdefault('sub', user_response.user.id)
+    claims.setdefault('email', user_response.user.email)
+    return claims
+
+
+@span('auth')
+def resolve_user(token):
+    """
+    Return the SupabaseUser for a token, or None if it is invalid or expired.
+    """
+    key = hashlib.sha256(token.encode('utf-8')).hexdigest()
+    now = time.time()
+
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                _cache.move_to_end(key)
+                return entry[1]
+            del _cache[key]
+
+    try:
+        claims = _decode_locally(token)
+        if claims is None:
+            claims = _verify_remotely(token)
+    except jwt.InvalidTokenError:
+        return None
+    except Exception as e:
+        logger.warning(f"Token verification failed: {e}")
+        return None
+
+    if not claims or not claims.get('sub'):
+        return None
+
+    user = SupabaseUser(claims['sub'], claims.get('email'), claims)
+    expires_at = min(now + AUTH_CACHE_TTL, claims.get('exp', now + AUTH_CACHE_TTL))
+    if expires_at > now:
+        with _cache_lock:
+            _cache[key] = (expires_at, user)
+            while len(_cache) > AUTH_CACHE_MAX_ENTRIES:
+                _cache.popitem(last=False)
+    return user
+
+
+class SupabaseAuthMiddleware:
+    """
+    Attach `request.supabase_user` (a SupabaseUser or None) from the Bearer token.
+    Runs natively under ASGI so async views are not forced onto a thread.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        token = get_bearer_token(request)
+        request.supabase_token = token
+        request.supabase_user = resolve_user(token) if token else None
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        token = get_bearer_token(request)
+        request.supabase_token = token
+        # Remote verification may block on the network
+        request.supabase_user = await sync_to_async(resolve_user)(token) if token else None
+        return await self.get_response(request)
+
+
+def supabase_login_required(view):
+    """
+    Reject requests without a valid Supabase token with a 401 JSON error.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not request.supabase_token:
+            return JsonResponse({'error': 'Authentication required'}, status=401)
+        if request.supabase_user is None:
+            return JsonResponse({'error': 'Invalid token'}, status=401)
+        return view(request, *args, **kwargs)
+    return wrapper
@@ -1,19 +1,52 @@
 import os
-from supabase import create_client, Client
+import threading
+from typing import TYPE_CHECKING
 from django.conf import settings
 
+if TYPE_CHECKING:
+    from supabase import Client
+
 # Initialize Supabase client
-def get_supabase_client() -> Client:
+def get_supabase_client() -> 'Client':
     """
     Create and return a Supabase client instance
     """
+    # Imported here so processes that never talk to Supabase don't pay for the SDK
+    from supabase import create_client
+
     url = os.getenv('VITE_SUPABASE_URL')
     key = os.getenv('VITE_SUPABASE_ANON_KEY')
-    
+
     if not url or not key:
         raise ValueError("Supabase URL and ANON KEY must be set in environment variables")
-    
+
     return create_client(url, key)
 
+
+class LazySupabaseClient:
+    """
+    Process-wide Supabase client created on first use. A forked worker builds its
+    own client instead of sharing the parent's connection pool.
+    """
+
+    def __init__(self, factory=get_supabase_client):
+        self._factory = factory
+        self._client = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def get(self) -> 'Client':
+        if self._client is not None and self._pid == os.getpid():
+            return self._client
+        with self._lock:
+            if self._client is None or self._pid != os.getpid():
+                self._client = self._factory()
+                self._pid = os.getpid()
+        return self._client
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+
 # Global client instance
-supabase: Client = get_supabase_client()
\ No newline at end of file
+supabase = LazySupabaseClient()
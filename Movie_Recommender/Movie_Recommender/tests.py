@@ -0,0 +1,266 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+from unittest import mock
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from django.http import StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase
+
+from . import catalog, instrumentation, movie_cache, omdb_client, supabase_auth, views
+from .rate_limit import TokenBucketLimiter
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def open_breaker(self):
+        breaker = omdb_client.CircuitBreaker(threshold=1, cooldown=0)
+        breaker.record_failure()
+        return breaker
+
+    def test_cancelled_trial_is_released(self):
+        async def slow_request(params):
+            await asyncio.sleep(5)
+
+        breaker = self.open_breaker()
+        with mock.patch.object(omdb_client, 'breaker', breaker), \
+                mock.patch.object(omdb_client, '_request_async', slow_request):
+            with self.assertRaises(asyncio.TimeoutError):
+                asyncio.run(asyncio.wait_for(omdb_client.get_movie_async('Heat'), 0.05))
+
+        self.assertTrue(breaker.allow())
+
+    def test_failed_trial_keeps_breaker_open(self):
+        async def failing_request(params):
+            raise omdb_client.OMDbUnavailable('down')
+
+        breaker = self.open_breaker()
+        breaker.cooldown = 60
+        breaker._opened_at -= 60
+        with mock.patch.object(omdb_client, 'breaker', breaker), \
+                mock.patch.object(omdb_client, '_request_async', failing_request):
+            with self.assertRaises(omdb_client.OMDbUnavailable):
+                asyncio.run(omdb_client.get_movie_async('Heat'))
+
+        self.assertTrue(breaker.is_open)
+        self.assertFalse(breaker.allow())
+
+
+def omdb_movie(imdb_id, title):
+    return {'Response': 'True', 'imdbID': imdb_id, 'Title': title, 'Year': '2000', 'Plot': ''}
+
+
+OMDB_NOT_FOUND = {'Response': 'False', 'Error': 'Movie not found!'}
+OMDB_INCORRECT_ID = {'Response': 'False', 'Error': 'Incorrect IMDb ID.'}
+
+
+class TitleIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = catalog.TitleIndex()
+        for imdb_id, title in [('tt1', 'Toy Story 3'), ('tt2', 'Scream V'), ('tt3', 'Spider-Man 2'), ('tt4', 'Rocky II'),
+                               ('tt5', 'The Shawshank Redemption'), ('tt6', 'The Godfather Part II')]:
+            self.index.add(imdb_id, title)
+
+    def test_sequels_do_not_match_each_other(self):
+        for query in ['Toy Story 4', 'Toy Story 2', 'Toy Story', 'Scream VI', 'Spider-Man 3', 'Rocky III']:
+            with self.subTest(query=query):
+                self.assertIsNone(self.index.match(query))
+
+    def test_same_sequel_number_still_matches_fuzzily(self):
+        self.assertEqual(self.index.match('Godfather Part 2')[0], 'tt6')
+        self.assertEqual(self.index.match('Spiderman 2')[0], 'tt3')
+
+    def test_misspelling_matches_with_fuzzy_score(self):
+        imdb_id, score = self.index.match('Shawshank Redemtion')
+        self.assertEqual(imdb_id, 'tt5')
+        self.assertLess(score, 1.0)
+
+    def test_sequel_numbers(self):
+        self.assertEqual(catalog.sequel_numbers('rocky iv'), {4})
+        self.assertEqual(catalog.sequel_numbers('rocky 4'), {4})
+        self.assertEqual(catalog.sequel_numbers('the godfather part ii'), {2})
+        self.assertEqual(catalog.sequel_numbers('heat'), set())
+
+
+class FuzzyTitleResolutionTests(TestCase):
+    def setUp(self):
+        movie_cache.memory_cache.clear()
+        index = catalog.TitleIndex()
+        index.add('tt5', 'The Shawshank Redemption')
+        patcher = mock.patch.object(catalog, 'get_index', return_value=index)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_omdb_title_lookup_wins_over_fuzzy_match(self):
+        found = omdb_movie('tt9', 'Shawshank Redemptions')
+        with mock.patch.object(omdb_client, 'get_movie', return_value=found) as get_movie:
+            details = views.fetch_movie_details('Shawshank Redemptions')
+
+        self.assertEqual(details['imdbID'], 'tt9')
+        get_movie.assert_called_once_with(title='Shawshank Redemptions', year=None)
+
+    def test_fuzzy_match_used_after_omdb_misses(self):
+        responses = {'Shawshank Redemtion': OMDB_NOT_FOUND, 'tt5': omdb_movie('tt5', 'The Shawshank Redemption')}
+        with mock.patch.object(omdb_client, 'get_movie',
+                               side_effect=lambda title=None, imdb_id=None, **kwargs: responses[title or imdb_id]):
+            details = views.fetch_movie_details('Shawshank Redemtion')
+
+        self.assertEqual(details['imdbID'], 'tt5')
+
+    def test_rejected_catalog_id_falls_back_to_title_search(self):
+        catalog.get_index().add('tt9999999', 'Heat')
+        responses = {'tt9999999': OMDB_INCORRECT_ID, 'Heat': omdb_movie('tt0113277', 'Heat')}
+        with mock.patch.object(omdb_client, 'get_movie',
+                               side_effect=lambda title=None, imdb_id=None, **kwargs: responses[title or imdb_id]) as get_movie:
+            details = views.fetch_movie_details('Heat')
+
+        self.assertEqual(details['imdbID'], 'tt0113277')
+        self.assertEqual(get_movie.call_args_list, [mock.call(imdb_id='tt9999999'), mock.call(title='Heat', year=None)])
+        self.assertEqual(movie_cache.lookup_title('Heat')['imdbID'], 'tt0113277')
+
+    def test_title_only_negatively_cached_after_title_search_misses(self):
+        catalog.get_index().add('tt9999999', 'Heat')
+        responses = {'tt9999999': OMDB_INCORRECT_ID, 'Heat': OMDB_NOT_FOUND}
+        with mock.patch.object(omdb_client, 'get_movie',
+                               side_effect=lambda title=None, imdb_id=None, **kwargs: responses[title or imdb_id]) as get_movie:
+            views.fetch_movie_details('Heat')
+
+        get_movie.assert_called_with(title='Heat', year=None)
+        self.assertIs(movie_cache.lookup_title('Heat'), movie_cache.NOT_FOUND)
+
+
+class TimingMiddlewareTests(SimpleTestCase):
+    def test_streamed_response_is_timed_until_the_stream_closes(self):
+        def body():
+            with instrumentation.span('omdb'):
+                time.sleep(0.02)
+            yield b'card'
+
+        middleware = instrumentation.TimingMiddleware(lambda request: StreamingHttpResponse(body()))
+        with self.assertLogs('Movie_Recommender.instrumentation', 'INFO') as logs:
+            response = middleware(RequestFactory().get('/trending-movies/?stream=1'))
+            self.assertEqual(b''.join(response.streaming_content), b'card')
+
+        entry = json.loads(logs.records[-1].getMessage())
+        self.assertTrue(entry['streamed'])
+        self.assertEqual(entry['spans']['omdb']['count'], 1)
+        self.assertGreaterEqual(entry['total_ms'], 20)
+
+
+class MetricsAccessTests(SimpleTestCase):
+    def test_token_required_when_configured(self):
+        request = RequestFactory().get('/metrics/', REMOTE_ADDR='127.0.0.1')
+        with mock.patch.object(instrumentation, 'METRICS_TOKEN', 'scrape-secret'):
+            self.assertEqual(instrumentation.metrics(request).status_code, 403)
+            request.META['HTTP_AUTHORIZATION'] = 'Bearer wrong'
+            self.assertEqual(instrumentation.metrics(request).status_code, 403)
+            request.META['HTTP_AUTHORIZATION'] = 'Bearer scrape-secret'
+            self.assertEqual(instrumentation.metrics(request).status_code, 200)
+
+    def test_other_addresses_are_refused(self):
+        request = RequestFactory().get('/metrics/', REMOTE_ADDR='203.0.113.5')
+        self.assertEqual(instrumentation.metrics(request).status_code, 403)
+
+
+class BulkDetailsRateLimitTests(TransactionTestCase):
+    def setUp(self):
+        movie_cache.memory_cache.clear()
+        patcher = mock.patch.object(views, 'bulk_details_limiter', TokenBucketLimiter(rate=0.01, burst=3))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, movies):
+        return self.client.post('/api/movies/details/', json.dumps({'movies': movies}), content_type='application/json')
+
+    def test_cache_misses_spend_the_budget(self):
+        with mock.patch.object(omdb_client, 'get_movie',
+                               side_effect=lambda title=None, **kwargs: omdb_movie(f'tt-{title}', title)) as get_movie:
+            response = self.post(['Heat', 'Alien', 'Ran', 'Up'])
+            self.assertEqual(response.status_code, 429)
+            self.assertIn('Retry-After', response)
+            get_movie.assert_not_called()
+
+            self.assertEqual(self.post(['Heat', 'Alien']).status_code, 200)
+            # Cached titles are free; one more miss uses the last token
+            response = self.post(['Heat', 'Alien', 'Ran'])
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([movie['Title'] for movie in response.json()['movies']], ['Heat', 'Alien', 'Ran'])
+            self.assertEqual(self.post(['Up']).status_code, 429)
+
+
+TEST_JWT_SECRET = 'test-project-jwt-secret-0123456789abcdef'
+
+
+def make_token(key=TEST_JWT_SECRET, algorithm='HS256', headers=None, **claims):
+    claims = {'sub': 'user-1', 'email': 'user@example.com', 'aud': 'authenticated',
+              'exp': int(time.time()) + 3600, **claims}
+    return jwt.encode(claims, key, algorithm=algorithm, headers=headers)
+
+
+class SupabaseAuthTests(SimpleTestCase):
+    def setUp(self):
+        supabase_auth._cache.clear()
+        for name, value in [('SUPABASE_JWT_SECRET', TEST_JWT_SECRET), ('SUPABASE_JWKS_FILE', None), ('_jwks', None)]:
+            patcher = mock.patch.object(supabase_auth, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        # A token that fails local checks must never be accepted through the Supabase round-trip
+        patcher = mock.patch.object(supabase_auth, '_verify_remotely', side_effect=AssertionError('remote call'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(supabase_auth._cache.clear)
+
+    def test_valid_hs256_token(self):
+        user = supabase_auth.resolve_user(make_token())
+        self.assertEqual(user.id, 'user-1')
+        self.assertEqual(user.email, 'user@example.com')
+
+    def test_expired_token(self):
+        self.assertIsNone(supabase_auth.resolve_user(make_token(exp=int(time.time()) - 60)))
+
+    def test_wrong_audience(self):
+        self.assertIsNone(supabase_auth.resolve_user(make_token(aud='anon')))
+
+    def test_bad_signature(self):
+        self.assertIsNone(supabase_auth.resolve_user(make_token(key='another-secret-that-is-long-enough-000')))
+
+    def test_unknown_kid_with_jwks(self):
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+        jwk.update({'kid': 'known', 'alg': 'RS256', 'use': 'sig'})
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+            json.dump({'keys': [jwk]}, f)
+        self.addCleanup(os.remove, f.name)
+
+        with mock.patch.object(supabase_auth, 'SUPABASE_JWKS_FILE', f.name):
+            known = make_token(private_key, 'RS256', headers={'kid': 'known'})
+            unknown = make_token(private_key, 'RS256', headers={'kid': 'rotated-away'})
+            self.assertEqual(supabase_auth.resolve_user(known).id, 'user-1')
+            self.assertIsNone(supabase_auth.resolve_user(unknown))
+
+    def test_cache_ttl_capped_at_token_expiry(self):
+        exp = int(time.time()) + 10
+        token = make_token(exp=exp)
+        with mock.patch.object(supabase_auth, 'AUTH_CACHE_TTL', 300):
+            supabase_auth.resolve_user(token)
+
+        (expires_at, user), = supabase_auth._cache.values()
+        self.assertEqual(expires_at, exp)
+        # Once the cached entry lapses the token is verified again, and rejected when expired
+        with mock.patch.object(supabase_auth.time, 'time', return_value=exp + 1), \
+                mock.patch.object(supabase_auth, '_decode_locally', side_effect=jwt.ExpiredSignatureError):
+            self.assertIsNone(supabase_auth.resolve_user(token))
+
+    def test_login_required_rejects_missing_and_invalid_tokens(self):
+        response = self.client.get('/api/user/recommendations/')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()['error'], 'Authentication required')
+
+        for token in ['not-a-jwt', make_token(aud='anon'), make_token(exp=int(time.time()) - 60)]:
+            with self.subTest(token=token[:20]):
+                response = self.client.get('/api/user/recommendations/', HTTP_AUTHORIZATION=f'Bearer {token}')
+                self.assertEqual(response.status_code, 401)
+                self.assertEqual(response.json()['error'], 'Invalid token')
@@ -14,18 +14,33 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+import os
+import logging
+
 from django.contrib import admin
 from django.urls import path
 from Movie_Recommender import views
+from Movie_Recommender.instrumentation import metrics
+
+# Serve the LLM/OMDb-bound endpoints from async views. Their httpx and Gemini async clients
+# are bound to one event loop, so they only run under an ASGI server (asgi.py); under WSGI or
+# runserver every request would get a fresh loop and leak a client per request.
+if os.getenv('ASYNC_VIEWS', 'false').lower() == 'true' and os.getenv('MOVIE_RECOMMENDER_ASGI') == 'true':
+    from Movie_Recommender import async_views as io_views
+else:
+    if os.getenv('ASYNC_VIEWS', 'false').lower() == 'true':
+        logging.getLogger(__name__).warning("ASYNC_VIEWS needs an ASGI server; serving the sync views")
+    io_views = views
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics/', metrics, name='metrics'),
     path('', views.Home, name='home'),
     path('feedback/', views.feedback, name='feedback'),
-    path('mood-recommendations/', views.mood_recommendations, name='mood_recommendations'),
-    path('trending-movies/', views.get_trending_movies, name='trending_movies'),
-    path('recent-movies/', views.get_recent_movies, name='recent_movies'),
-    path('movie-details/<str:imdb_id>/', views.get_movie_details_api, name='movie_details_api'),
+    path('mood-recommendations/', io_views.mood_recommendations, name='mood_recommendations'),
+    path('trending-movies/', io_views.get_trending_movies, name='trending_movies'),
+    path('recent-movies/', io_views.get_recent_movies, name='recent_movies'),
+    path('movie-details/<str:imdb_id>/', io_views.get_movie_details_api, name='movie_details_api'),
     
     # Authentication endpoints
     path('api/auth/signup/', views.signup, name='signup'),
@@ -34,6 +49,10 @@ urlpatterns = [
     path('api/auth/profile/', views.get_user_profile, name='user_profile'),
     
     # User interaction endpoints
+    path('api/search/', views.search_movies, name='search_movies'),
+    path('api/search/suggest/', views.suggest_movies, name='suggest_movies'),
+    path('api/movies/details/', views.get_movie_details_bulk, name='movie_details_bulk'),
     path('api/movies/track/', views.track_movie_interaction, name='track_movie'),
+    path('api/movies/track/batch/', views.track_movie_interactions_batch, name='track_movies_batch'),
     path('api/user/recommendations/', views.get_user_recommendations, name='user_recommendations'),
 ]
\ No newline at end of file
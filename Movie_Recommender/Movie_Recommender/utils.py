@@ -1,12 +1,10 @@
 import os
-
-os.environ['GRPC_VERBOSITY'] = 'ERROR'
-
-import google.generativeai as genai
 from dotenv import load_dotenv
 from django.http import JsonResponse
 import logging
 import json
+from .mood_cache import mood_cache, normalize_mood
+from .llm_client import GeminiClient
 
 # Load environment variables from the .env file
 load_dotenv()
@@ -16,6 +14,37 @@ logger = logging.getLogger(__name__)
 # Retrieve the GOOGLE_GEMINI_API key
 API_KEY = os.getenv('API_KEY')
 
+# Shared Gemini model handle, configured on first use
+gemini = GeminiClient(API_KEY)
+
+# Primary emotion categories shared by the mood analysis prompts
+MOOD_CATEGORIES = ['happy', 'sad', 'excited', 'romantic', 'adventurous', 'thoughtful', 'nostalgic', 'anxious']
+
+# JSON schema for the combined mood analysis + recommendation call
+MOOD_RECOMMENDATION_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        'mood_category': {'type': 'STRING', 'enum': MOOD_CATEGORIES},
+        'movies': {
+            'type': 'ARRAY',
+            'items': {
+                'type': 'OBJECT',
+                'properties': {
+                    'title': {'type': 'STRING'},
+                    'year': {'type': 'INTEGER'},
+                },
+                'required': ['title', 'year'],
+            },
+        },
+    },
+    'required': ['mood_category', 'movies'],
+}
+
+MOOD_RECOMMENDATION_CONFIG = {
+    'response_mime_type': 'application/json',
+    'response_schema': MOOD_RECOMMENDATION_SCHEMA,
+}
+
 def get_movie_suggestions_from_mood(mood):
     """
     Use Google Gemini API to generate movie suggestions based on user mood.
@@ -23,10 +52,7 @@ def get_movie_suggestions_from_mood(mood):
     try:
         # AI prompt for generating movie recommendations
         prompt = f"Suggest 10 random Hollywood and Bollywood movies for someone in a '{mood}' mood. Return only movie names, separated by commas."
-        genai.configure(api_key=API_KEY)
-        
-        model = genai.GenerativeModel("gemini-1.5-flash")
-        response = model.generate_content(prompt)
+        response = gemini.generate(prompt)
         
         if response.text:
             movie_list = [movie.strip() for movie in response.text.split(',')]
@@ -41,6 +67,14 @@ def get_movie_suggestions_from_mood(mood):
 def get_enhanced_movie_suggestions_from_mood(mood):
     """
     Enhanced AI function to generate detailed movie suggestions based on user mood with reasoning.
+    Results are memoized per normalized mood; identical concurrent moods share one LLM call.
+    """
+    movies = mood_cache.get_or_compute(normalize_mood(mood), lambda: generate_enhanced_movie_suggestions(mood))
+    return movies if movies else get_fallback_recommendations(mood)
+
+def generate_enhanced_movie_suggestions(mood):
+    """
+    Ask Gemini for movie suggestions for a mood. Returns None when no usable answer comes back.
     """
     try:
         # Enhanced AI prompt for better movie recommendations
@@ -66,9 +100,7 @@ def get_enhanced_movie_suggestions_from_mood(mood):
         Return only the movie titles, separated by commas. Make sure all titles are accurate and well-known films.
         """
         
-        genai.configure(api_key=API_KEY)
-        model = genai.GenerativeModel("gemini-1.5-flash")
-        response = model.generate_content(prompt)
+        response = gemini.generate(prompt)
         
         if response.text:
             movie_list = [movie.strip() for movie in response.text.split(',')]
@@ -80,41 +112,145 @@ def get_enhanced_movie_suggestions_from_mood(mood):
                 if cleaned_movie and len(cleaned_movie) > 2:
                     cleaned_movies.append(cleaned_movie)
             
-            return cleaned_movies[:8]  # Return max 8 movies
+            return cleaned_movies[:8] or None  # Return max 8 movies
         else:
-            return get_fallback_recommendations(mood)
+            return None
 
     except Exception as e:
         print(f"Error in enhanced recommendations: {e}")
-        return get_fallback_recommendations(mood)
+        return None
+
+def get_mood_analysis_and_recommendations(mood):
+    """
+    Classify the mood and suggest movies (with release years) in a single Gemini call.
+    Returns {'mood_category': str or None, 'movies': [{'title': str, 'year': int or None}, ...]}.
+    """
+    result = mood_cache.get_or_compute(f"combined|{normalize_mood(mood)}", lambda: generate_mood_analysis_and_recommendations(mood))
+    if result:
+        return result
+
+    return {
+        'mood_category': None,
+        'movies': [{'title': title, 'year': None} for title in get_fallback_recommendations(mood)]
+    }
+
+def generate_mood_analysis_and_recommendations(mood):
+    """
+    Ask Gemini for a structured JSON answer. Returns None when the answer is unusable.
+    """
+    try:
+        response = gemini.generate(build_mood_recommendation_prompt(mood), generation_config=MOOD_RECOMMENDATION_CONFIG)
+        return parse_mood_recommendations(response.text)
+
+    except Exception as e:
+        print(f"Error in combined mood recommendations: {e}")
+        return None
+
+async def get_mood_analysis_and_recommendations_async(mood):
+    """
+    Non-blocking variant of get_mood_analysis_and_recommendations for async views.
+    """
+    result = await mood_cache.get_or_compute_async(f"combined|{normalize_mood(mood)}", lambda: generate_mood_analysis_and_recommendations_async(mood))
+    if result:
+        return result
+
+    return {
+        'mood_category': None,
+        'movies': [{'title': title, 'year': None} for title in get_fallback_recommendations(mood)]
+    }
+
+async def generate_mood_analysis_and_recommendations_async(mood):
+    """
+    Async Gemini call for the structured mood answer. Returns None when the answer is unusable.
+    """
+    try:
+        response = await gemini.generate_async(build_mood_recommendation_prompt(mood), generation_config=MOOD_RECOMMENDATION_CONFIG)
+        return parse_mood_recommendations(response.text)
+
+    except Exception as e:
+        print(f"Error in combined mood recommendations: {e}")
+        return None
+
+def build_mood_recommendation_prompt(mood):
+    """
+    Prompt for the combined mood analysis + recommendation call.
+    """
+    return f"""
+        As a movie expert, analyze this mood/feeling: "{mood}"
+
+        1. Categorize it into exactly one of these primary emotions: {', '.join(MOOD_CATEGORIES)}.
+        2. Suggest 8 perfect movies for someone feeling this way, mixing recent releases (2020-2024),
+           classic films, different genres and both Hollywood and international cinema.
+
+        Use the exact official English release title and the original theatrical release year of each movie.
+        """
+
+def parse_mood_recommendations(text):
+    """
+    Validate the JSON answer of the combined call. Returns None when it holds no movies.
+    """
+    data = json.loads(text)
+
+    movies = []
+    for movie in data.get('movies', []):
+        title = str(movie.get('title', '')).strip()
+        year = movie.get('year')
+        if title:
+            movies.append({'title': title, 'year': year if isinstance(year, int) else None})
+
+    if not movies:
+        return None
+
+    category = str(data.get('mood_category', '')).strip().lower()
+    return {
+        'mood_category': category if category in MOOD_CATEGORIES else None,
+        'movies': movies[:8]
+    }
+
+# Curated picks per mood, used when AI fails and to seed local retrieval indexes
+FALLBACK_MOOD_MOVIES = {
+    'happy': ['The Grand Budapest Hotel', 'La La Land', 'Paddington 2', 'The Princess Bride', 'Mamma Mia!', 'School of Rock', 'The Incredibles', 'Ferris Bueller\'s Day Off'],
+    'sad': ['Inside Out', 'Her', 'The Pursuit of Happyness', 'Good Will Hunting', 'A Monster Calls', 'The Green Mile', 'Marley & Me', 'Up'],
+    'excited': ['Mad Max: Fury Road', 'John Wick', 'Mission: Impossible', 'The Avengers', 'Baby Driver', 'Speed', 'Die Hard', 'Top Gun: Maverick'],
+    'romantic': ['The Notebook', 'Casablanca', 'When Harry Met Sally', 'Pride and Prejudice', 'Titanic', 'Before Sunrise', 'Sleepless in Seattle', 'The Holiday'],
+    'adventurous': ['Indiana Jones', 'Pirates of the Caribbean', 'The Lord of the Rings', 'Jurassic Park', 'National Treasure', 'The Mummy', 'Tomb Raider', 'Uncharted'],
+    'thoughtful': ['Inception', 'Interstellar', 'The Matrix', 'Blade Runner 2049', 'Arrival', 'Ex Machina', 'Her', 'The Social Dilemma'],
+    'nostalgic': ['Back to the Future', 'E.T.', 'The Goonies', 'Stand by Me', 'The Sandlot', 'Home Alone', 'Toy Story', 'The Lion King'],
+    'scared': ['Get Out', 'A Quiet Place', 'Hereditary', 'The Conjuring', 'It', 'Scream', 'Halloween', 'The Babadook']
+}
 
 def get_fallback_recommendations(mood):
     """
     Fallback movie recommendations when AI fails.
     """
-    mood_movies = {
-        'happy': ['The Grand Budapest Hotel', 'La La Land', 'Paddington 2', 'The Princess Bride', 'Mamma Mia!', 'School of Rock', 'The Incredibles', 'Ferris Bueller\'s Day Off'],
-        'sad': ['Inside Out', 'Her', 'The Pursuit of Happyness', 'Good Will Hunting', 'A Monster Calls', 'The Green Mile', 'Marley & Me', 'Up'],
-        'excited': ['Mad Max: Fury Road', 'John Wick', 'Mission: Impossible', 'The Avengers', 'Baby Driver', 'Speed', 'Die Hard', 'Top Gun: Maverick'],
-        'romantic': ['The Notebook', 'Casablanca', 'When Harry Met Sally', 'Pride and Prejudice', 'Titanic', 'Before Sunrise', 'Sleepless in Seattle', 'The Holiday'],
-        'adventurous': ['Indiana Jones', 'Pirates of the Caribbean', 'The Lord of the Rings', 'Jurassic Park', 'National Treasure', 'The Mummy', 'Tomb Raider', 'Uncharted'],
-        'thoughtful': ['Inception', 'Interstellar', 'The Matrix', 'Blade Runner 2049', 'Arrival', 'Ex Machina', 'Her', 'The Social Dilemma'],
-        'nostalgic': ['Back to the Future', 'E.T.', 'The Goonies', 'Stand by Me', 'The Sandlot', 'Home Alone', 'Toy Story', 'The Lion King'],
-        'scared': ['Get Out', 'A Quiet Place', 'Hereditary', 'The Conjuring', 'It', 'Scream', 'Halloween', 'The Babadook']
-    }
-    
     # Find the closest mood match
     mood_lower = mood.lower()
-    for key in mood_movies:
+    for key in FALLBACK_MOOD_MOVIES:
         if key in mood_lower or mood_lower in key:
-            return mood_movies[key]
+            return FALLBACK_MOOD_MOVIES[key]
     
     # Default recommendations
-    return mood_movies['happy']
+    return FALLBACK_MOOD_MOVIES['happy']
 
 def analyze_mood_sentiment(mood_text):
     """
     Analyze the sentiment and context of the mood input for better recommendations.
+    A local classifier answers confident cases; the LLM handles the rest.
+    """
+    from .mood_classifier import classify_mood, MOOD_CLASSIFIER_THRESHOLD
+
+    try:
+        category, confidence = classify_mood(mood_text)
+        if confidence >= MOOD_CLASSIFIER_THRESHOLD:
+            return category
+    except Exception as e:
+        print(f"Error in local mood classifier: {e}")
+
+    return analyze_mood_sentiment_with_llm(mood_text)
+
+def analyze_mood_sentiment_with_llm(mood_text):
+    """
+    Ask Gemini for the primary emotion category of a mood.
     """
     try:
         prompt = f"""
@@ -133,9 +269,7 @@ def analyze_mood_sentiment(mood_text):
         Return only the primary emotion category (one word).
         """
         
-        genai.configure(api_key=API_KEY)
-        model = genai.GenerativeModel("gemini-1.5-flash")
-        response = model.generate_content(prompt)
+        response = gemini.generate(prompt)
         
         if response.text:
             return response.text.strip().lower()
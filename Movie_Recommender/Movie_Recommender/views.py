@@ -1,14 +1,62 @@
 import os
 from django.shortcuts import render, redirect
 from django.contrib.auth import authenticate, login
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import parse_etags
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
-import requests
 import json
+import re
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import time
 from .models import Feedback
-from .utils import get_movie_suggestions_from_mood, get_enhanced_movie_suggestions_from_mood
+from . import movie_cache
+from . import omdb_client
+from . import snapshots
+from . import movie_search
+from . import catalog
+from . import card_renderer
+from . import streaming_links
+from .utils import get_movie_suggestions_from_mood, get_enhanced_movie_suggestions_from_mood, get_mood_analysis_and_recommendations
 from .supabase_client import supabase
+from .supabase_auth import supabase_login_required
+from .instrumentation import span
+from .rate_limit import TokenBucketLimiter
+from .interaction_queue import interaction_queue, upsert_interactions, INTERACTION_TYPES
+
+# Bounded concurrency for OMDb lookups when rendering a page of movie cards
+OMDB_FETCH_WORKERS = int(os.getenv('OMDB_FETCH_WORKERS', '8'))
+OMDB_FETCH_DEADLINE = float(os.getenv('OMDB_FETCH_DEADLINE', '8'))
+
+# Classify the mood and fetch titles with release years in a single LLM call
+MOOD_COMBINED_MODE = os.getenv('MOOD_COMBINED_MODE', 'true').lower() == 'true'
+
+# 'llm' asks Gemini for every mood; 'ann' retrieves from the local mood index first
+MOOD_ENGINE = os.getenv('MOOD_ENGINE', 'llm').lower()
+MOOD_RESULT_COUNT = 8
+
+# Upper bound on interactions accepted by one batch tracking request
+MAX_TRACKED_INTERACTIONS = 100
+
+# Upper bound on movies resolved by one bulk details request
+MAX_BULK_DETAILS = 50
+# Per-client budget for bulk lookups that miss the cache and reach OMDb, one token per miss;
+# a request with more misses than the burst is always refused, so keep it at least MAX_BULK_DETAILS
+BULK_DETAILS_RATE_PER_SECOND = float(os.getenv('BULK_DETAILS_RATE_PER_SECOND', '1'))
+BULK_DETAILS_RATE_BURST = int(os.getenv('BULK_DETAILS_RATE_BURST', str(MAX_BULK_DETAILS)))
+bulk_details_limiter = TokenBucketLimiter(BULK_DETAILS_RATE_PER_SECOND, BULK_DETAILS_RATE_BURST)
+IMDB_ID_PATTERN = re.compile(r'tt\d{7,}')
+
+# Number of typeahead suggestions returned per prefix
+CATALOG_SUGGESTION_COUNT = 8
+
+# Marks the end of each card in streamed card responses
+CARD_STREAM_DELIMITER = '<!--card-end-->'
+CARD_STREAM_DELIMITER_BYTES = CARD_STREAM_DELIMITER.encode()
+
+# Shared pool so concurrent requests cannot open an unbounded number of OMDb calls
+omdb_executor = ThreadPoolExecutor(max_workers=OMDB_FETCH_WORKERS, thread_name_prefix='omdb-fetch')
 
 # Home page view
 def Home(request):
@@ -32,16 +80,17 @@ def signup(request):
             return JsonResponse({'error': 'Email and password are required'}, status=400)
 
         # Sign up user with Supabase
-        response = supabase.auth.sign_up({
-            "email": email,
-            "password": password,
-            "options": {
-                "data": {
-                    "full_name": full_name,
-                    "username": username
+        with span('supabase'):
+            response = supabase.auth.sign_up({
+                "email": email,
+                "password": password,
+                "options": {
+                    "data": {
+                        "full_name": full_name,
+                        "username": username
+                    }
                 }
-            }
-        })
+            })
 
         if response.user:
             return JsonResponse({
@@ -72,10 +121,11 @@ def signin(request):
             return JsonResponse({'error': 'Email and password are required'}, status=400)
 
         # Sign in user with Supabase
-        response = supabase.auth.sign_in_with_password({
-            "email": email,
-            "password": password
-        })
+        with span('supabase'):
+            response = supabase.auth.sign_in_with_password({
+                "email": email,
+                "password": password
+            })
 
         if response.user:
             return JsonResponse({
@@ -102,40 +152,32 @@ def signout(request):
     Handle user logout
     """
     try:
-        supabase.auth.sign_out()
+        with span('supabase'):
+            supabase.auth.sign_out()
         return JsonResponse({'message': 'Logout successful!'})
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
 @csrf_exempt
 @require_http_methods(["GET"])
+@supabase_login_required
 def get_user_profile(request):
     """
     Get user profile information
     """
     try:
-        auth_header = request.headers.get('Authorization')
-        if not auth_header:
-            return JsonResponse({'error': 'Authorization header required'}, status=401)
-
-        token = auth_header.replace('Bearer ', '')
-        
-        # Get user from token
-        user_response = supabase.auth.get_user(token)
-        if not user_response.user:
-            return JsonResponse({'error': 'Invalid token'}, status=401)
-
-        user_id = user_response.user.id
+        user_id = request.supabase_user.id
 
         # Get profile data
-        profile_response = supabase.table('profiles').select('*').eq('id', user_id).execute()
+        with span('supabase'):
+            profile_response = supabase.table('profiles').select('*').eq('id', user_id).execute()
         
         profile = profile_response.data[0] if profile_response.data else None
 
         return JsonResponse({
             'user': {
-                'id': user_response.user.id,
-                'email': user_response.user.email,
+                'id': request.supabase_user.id,
+                'email': request.supabase_user.email,
                 'profile': profile
             }
         })
@@ -165,17 +207,8 @@ def feedback(request):
             if not all([name, email, message]):
                 return JsonResponse({'error': 'All fields are required'}, status=400)
 
-            # Get user ID if authenticated
-            user_id = None
-            auth_header = request.headers.get('Authorization')
-            if auth_header:
-                try:
-                    token = auth_header.replace('Bearer ', '')
-                    user_response = supabase.auth.get_user(token)
-                    if user_response.user:
-                        user_id = user_response.user.id
-                except:
-                    pass  # Continue as anonymous user
+            # Get user ID if authenticated, otherwise continue as anonymous user
+            user_id = request.supabase_user.id if request.supabase_user else None
 
             # Save feedback to Supabase
             feedback_data = {
@@ -186,7 +219,8 @@ def feedback(request):
                 'user_id': user_id
             }
 
-            response = supabase.table('feedback').insert(feedback_data).execute()
+            with span('supabase'):
+                response = supabase.table('feedback').insert(feedback_data).execute()
 
             if response.data:
                 return JsonResponse({
@@ -205,20 +239,12 @@ def feedback(request):
 # Track user movie interactions
 @csrf_exempt
 @require_http_methods(["POST"])
+@supabase_login_required
 def track_movie_interaction(request):
     """
     Track user interactions with movies (viewed, liked, watchlist)
     """
     try:
-        auth_header = request.headers.get('Authorization')
-        if not auth_header:
-            return JsonResponse({'error': 'Authentication required'}, status=401)
-
-        token = auth_header.replace('Bearer ', '')
-        user_response = supabase.auth.get_user(token)
-        if not user_response.user:
-            return JsonResponse({'error': 'Invalid token'}, status=401)
-
         data = json.loads(request.body)
         movie_title = data.get('movie_title')
         imdb_id = data.get('imdb_id')
@@ -228,27 +254,60 @@ def track_movie_interaction(request):
         if not all([movie_title, interaction_type]):
             return JsonResponse({'error': 'Movie title and interaction type are required'}, status=400)
 
-        # Check if interaction already exists
-        existing = supabase.table('user_movie_interactions').select('*').eq('user_id', user_response.user.id).eq('movie_title', movie_title).eq('interaction_type', interaction_type).execute()
-
-        if existing.data:
-            return JsonResponse({'message': 'Interaction already recorded'})
-
-        # Insert new interaction
-        interaction_data = {
-            'user_id': user_response.user.id,
+        # Insert new interaction; the unique index makes repeats a no-op
+        inserted = upsert_interactions([{
+            'user_id': request.supabase_user.id,
             'movie_title': movie_title,
             'imdb_id': imdb_id,
             'interaction_type': interaction_type,
             'mood_context': mood_context
-        }
+        }])
 
-        response = supabase.table('user_movie_interactions').insert(interaction_data).execute()
-
-        if response.data:
+        if inserted:
             return JsonResponse({'message': 'Interaction tracked successfully'})
         else:
-            return JsonResponse({'error': 'Failed to track interaction'}, status=500)
+            return JsonResponse({'message': 'Interaction already recorded'})
+
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@supabase_login_required
+def track_movie_interactions_batch(request):
+    """
+    Track many user interactions with movies in a single request and a single upsert.
+    """
+    try:
+        data = json.loads(request.body)
+        interactions = data.get('interactions')
+
+        if not isinstance(interactions, list) or not interactions:
+            return JsonResponse({'error': 'A non-empty interactions list is required'}, status=400)
+        if len(interactions) > MAX_TRACKED_INTERACTIONS:
+            return JsonResponse({'error': f'At most {MAX_TRACKED_INTERACTIONS} interactions per request'}, status=400)
+
+        rows = []
+        for interaction in interactions:
+            if not isinstance(interaction, dict):
+                return JsonResponse({'error': 'Each interaction must be an object'}, status=400)
+            if not interaction.get('movie_title') or interaction.get('interaction_type') not in INTERACTION_TYPES:
+                return JsonResponse({'error': 'Each interaction needs a movie title and a valid interaction type'}, status=400)
+            rows.append({
+                'user_id': request.supabase_user.id,
+                'movie_title': interaction['movie_title'],
+                'imdb_id': interaction.get('imdb_id'),
+                'interaction_type': interaction['interaction_type'],
+                'mood_context': interaction.get('mood_context', '')
+            })
+
+        inserted = upsert_interactions(rows)
+
+        return JsonResponse({
+            'message': 'Interactions tracked successfully',
+            'tracked': len(inserted),
+            'already_recorded': len(rows) - len(inserted)
+        })
 
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
@@ -256,28 +315,41 @@ def track_movie_interaction(request):
 # Get user's movie history and recommendations
 @csrf_exempt
 @require_http_methods(["GET"])
+@supabase_login_required
 def get_user_recommendations(request):
     """
     Get personalized recommendations based on user's movie history
     """
     try:
-        auth_header = request.headers.get('Authorization')
-        if not auth_header:
-            return JsonResponse({'error': 'Authentication required'}, status=401)
-
-        token = auth_header.replace('Bearer ', '')
-        user_response = supabase.auth.get_user(token)
-        if not user_response.user:
-            return JsonResponse({'error': 'Invalid token'}, status=401)
-
         # Get user's movie interactions
-        interactions = supabase.table('user_movie_interactions').select('*').eq('user_id', user_response.user.id).order('created_at', desc=True).limit(20).execute()
+        with span('supabase'):
+            interactions = supabase.table('user_movie_interactions').select('*').eq('user_id', request.supabase_user.id).order('created_at', desc=True).limit(20).execute()
 
         # Get user's liked movies for better recommendations
         liked_movies = [interaction['movie_title'] for interaction in interactions.data if interaction['interaction_type'] == 'liked']
         
-        # Generate personalized recommendations based on liked movies
-        if liked_movies:
+        # Serve from the precomputed item-item model; Gemini only covers cold starts
+        from .recommender import recommend_for_user
+        source = 'collaborative'
+        try:
+            recommendations = recommend_for_user(interactions.data)
+        except Exception as e:
+            print(f"Error in collaborative recommendations: {e}")
+            recommendations = []
+
+        # Next, movies whose plot, genre and cast resemble the user's likes
+        if not recommendations and liked_movies:
+            from .content_index import more_like_these
+            liked = [interaction.get('imdb_id') or interaction['movie_title'] for interaction in interactions.data if interaction['interaction_type'] == 'liked']
+            try:
+                recommendations = more_like_these(liked)
+                source = 'content'
+            except Exception as e:
+                print(f"Error in content recommendations: {e}")
+
+        # Cold start: generate personalized recommendations based on liked movies
+        if not recommendations and liked_movies:
+            source = 'ai'
             # Use AI to generate recommendations based on user's preferences
             prompt = f"Based on these movies the user liked: {', '.join(liked_movies[:5])}, recommend 8 similar movies they might enjoy."
             try:
@@ -285,14 +357,16 @@ def get_user_recommendations(request):
                 recommendations = get_enhanced_movie_suggestions_from_mood(f"movies similar to {', '.join(liked_movies[:3])}")
             except:
                 recommendations = ["The Shawshank Redemption", "The Godfather", "Pulp Fiction", "The Dark Knight", "Forrest Gump", "Inception", "The Matrix", "Goodfellas"]
-        else:
+        elif not recommendations:
             # Default popular recommendations for new users
+            source = 'default'
             recommendations = ["The Shawshank Redemption", "The Godfather", "Pulp Fiction", "The Dark Knight", "Forrest Gump", "Inception", "The Matrix", "Goodfellas"]
 
         return JsonResponse({
             'recommendations': recommendations,
             'user_history': interactions.data,
-            'liked_count': len(liked_movies)
+            'liked_count': len(liked_movies),
+            'source': source
         })
 
     except Exception as e:
@@ -312,38 +386,32 @@ def mood_recommendations(request):
             return HttpResponse('Mood input is required.', status=400)
 
         try:
+            ai_response = []
+            if MOOD_ENGINE == 'ann':
+                # Local embedding retrieval answers without waiting on Gemini
+                from .mood_index import search_movies_for_mood
+                try:
+                    ai_response = search_movies_for_mood(mood, MOOD_RESULT_COUNT)
+                except Exception as e:
+                    print(f"Error in mood index retrieval: {e}")
+
             # Call the enhanced utility function to get AI recommendations based on mood
-            ai_response = get_enhanced_movie_suggestions_from_mood(mood)
+            # (with the ANN engine, only to enrich a short result list)
+            if len(ai_response) < MOOD_RESULT_COUNT:
+                if MOOD_COMBINED_MODE:
+                    llm_response = get_mood_analysis_and_recommendations(mood)['movies']
+                else:
+                    llm_response = get_enhanced_movie_suggestions_from_mood(mood)
+                ai_response = add_llm_recommendations(ai_response, llm_response)
 
             # Check if AI provided recommendations
             if not ai_response:
                 return HttpResponse('No recommendations available for the provided mood.', status=404)
 
-            # Track mood search if user is authenticated
-            auth_header = request.headers.get('Authorization')
-            if auth_header:
-                try:
-                    token = auth_header.replace('Bearer ', '')
-                    user_response = supabase.auth.get_user(token)
-                    if user_response.user:
-                        # Track each recommended movie as viewed with mood context
-                        for movie in ai_response[:3]:  # Track first 3 recommendations
-                            try:
-                                supabase.table('user_movie_interactions').insert({
-                                    'user_id': user_response.user.id,
-                                    'movie_title': movie,
-                                    'interaction_type': 'viewed',
-                                    'mood_context': mood
-                                }).execute()
-                            except:
-                                pass  # Continue if tracking fails
-                except:
-                    pass  # Continue as anonymous user
+            track_recommended_movies(request, ai_response, mood)
 
             # Render the movie cards HTML with the recommendations
-            movie_cards_html = render_enhanced_movie_cards(ai_response)
-
-            return HttpResponse(movie_cards_html, content_type="text/html")
+            return movie_cards_response(request, ai_response)
 
         except Exception as e:
             print(f"Error generating recommendations: {e}")
@@ -351,14 +419,93 @@ def mood_recommendations(request):
 
     return HttpResponse('Invalid request method.', status=405)
 
-def fetch_movie_details(movie_name):
+def add_llm_recommendations(movies, llm_movies):
+    """
+    Top up retrieved movies with LLM suggestions, skipping duplicates, up to MOOD_RESULT_COUNT.
+    """
+    movies = list(movies)
+    seen = {movie_cache.normalize_title(get_movie_hint(movie)[0]) for movie in movies}
+    for movie in llm_movies:
+        if len(movies) >= MOOD_RESULT_COUNT:
+            break
+        if movie_cache.normalize_title(get_movie_hint(movie)[0]) not in seen:
+            movies.append(movie)
+    return movies
+
+def track_recommended_movies(request, movies, mood):
+    """
+    Track mood search if user is authenticated.
+    """
+    if request.supabase_user:
+        # Track each recommended movie as viewed with mood context (written in the background)
+        for movie in movies[:3]:  # Track first 3 recommendations
+            interaction_queue.enqueue({
+                'user_id': request.supabase_user.id,
+                'movie_title': get_movie_hint(movie)[0],
+                'interaction_type': 'viewed',
+                'mood_context': mood
+            })
+
+@span('fetch_movie_details')
+def fetch_movie_details(movie_name, year=None):
     """
     Fetches comprehensive movie details from OMDb API including streaming info.
+    An optional release year narrows the title lookup.
     """
-    url = f"http://www.omdbapi.com/?t={movie_name}&apikey={os.getenv('OMDB_API_KEY')}&plot=full"
-    response = requests.get(url)
-    data = response.json()
+    data = movie_cache.lookup_title(movie_name, year)
+    if data is movie_cache.NOT_FOUND:
+        # A wrong year hint should not hide a movie OMDb knows under its plain title
+        return fetch_movie_details(movie_name) if year else get_placeholder_movie_details(movie_name)
+
+    if data is None:
+        # A title the catalog knows under the same spelling resolves to its imdbID instead of a title search
+        match = catalog.resolve_title(movie_name, year)
+        exact_id = match[0] if match and match[1] >= 1.0 else None
+        if exact_id:
+            data = movie_cache.lookup_imdb_id(exact_id)
+            if data is not None and data is not movie_cache.NOT_FOUND:
+                movie_cache.store_alias(movie_name, data, year)
+                return format_movie_details(data, movie_name)
+
+        try:
+            if exact_id and data is None:
+                data = omdb_client.get_movie(imdb_id=exact_id)
+                if movie_cache.is_not_found(data):
+                    # A stale catalog row: forget the imdbID and search by title instead
+                    movie_cache.store_not_found(imdb_id=exact_id)
+            if data is None or data is movie_cache.NOT_FOUND or movie_cache.is_not_found(data):
+                data = omdb_client.get_movie(title=movie_name, year=year)
+                if match and not exact_id and not year and movie_cache.is_not_found(data):
+                    # A near-miss spelling only falls back to the closest catalog title once OMDb has no movie under it
+                    data = fetch_catalog_match(match[0]) or data
+        except omdb_client.OMDbUnavailable as e:
+            print(f"OMDb unavailable for {movie_name}: {e}")
+            return get_placeholder_movie_details(movie_name)
 
+        if data.get('Response') == 'True':
+            movie_cache.store(data, title=movie_name, year=year)
+        elif movie_cache.is_not_found(data):
+            movie_cache.store_not_found(title=movie_name, year=year)
+            if year:
+                return fetch_movie_details(movie_name)
+
+    return format_movie_details(data, movie_name)
+
+def fetch_catalog_match(imdb_id):
+    """
+    Cached or freshly fetched OMDb payload for a fuzzy catalog match, or None.
+    """
+    data = movie_cache.lookup_imdb_id(imdb_id)
+    if data is None:
+        data = omdb_client.get_movie(imdb_id=imdb_id)
+    if data is movie_cache.NOT_FOUND or data.get('Response') != 'True':
+        return None
+    return data
+
+def format_movie_details(data, movie_name):
+    """
+    Map an OMDb payload to the card fields, or to the placeholder when OMDb had no match.
+    """
     if data.get('Response') == 'True':
         return {
             'title': data.get('Title', movie_name),
@@ -375,94 +522,125 @@ def fetch_movie_details(movie_name):
             'metascore': data.get('Metascore', 'N/A')
         }
     else:
-        return {
-            'title': movie_name,
-            'poster': 'https://via.placeholder.com/300x450?text=No+Image',
-            'year': 'Unknown',
-            'genre': 'Unknown',
-            'director': 'Unknown',
-            'actors': 'Unknown',
-            'plot': 'No information available',
-            'rating': 'N/A',
-            'runtime': 'Unknown',
-            'language': 'Unknown',
-            'imdbID': '',
-            'metascore': 'N/A'
-        }
+        return get_placeholder_movie_details(movie_name)
+
+def get_placeholder_movie_details(movie_name):
+    """
+    Placeholder record used when a movie cannot be found or fetched.
+    """
+    return {
+        'title': movie_name,
+        'poster': 'https://via.placeholder.com/300x450?text=No+Image',
+        'year': 'Unknown',
+        'genre': 'Unknown',
+        'director': 'Unknown',
+        'actors': 'Unknown',
+        'plot': 'No information available',
+        'rating': 'N/A',
+        'runtime': 'Unknown',
+        'language': 'Unknown',
+        'imdbID': '',
+        'metascore': 'N/A'
+    }
+
+def get_movie_hint(movie):
+    """
+    Split a recommendation into (title, year). Items are plain titles or {'title', 'year'} dicts.
+    """
+    if isinstance(movie, dict):
+        return movie.get('title', ''), movie.get('year')
+    return movie, None
+
+def iter_movie_details_concurrently(movies):
+    """
+    Fetch details for many movies in parallel and yield them in input order,
+    each one as soon as it and every movie before it have resolved.
+    Lookups that fail or miss the deadline fall back to the placeholder record.
+    """
+    deadline = time.monotonic() + OMDB_FETCH_DEADLINE
+    hints = [get_movie_hint(movie) for movie in movies]
+    # Each lookup runs in a copy of the request context so its spans count towards the request
+    futures = [omdb_executor.submit(contextvars.copy_context().run, fetch_movie_details, title, year) for title, year in hints]
+
+    for (movie, _), future in zip(hints, futures):
+        try:
+            yield future.result(timeout=max(0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            future.cancel()
+            print(f"Timed out fetching details for {movie}")
+            yield get_placeholder_movie_details(movie)
+        except Exception as e:
+            print(f"Error fetching details for {movie}: {e}")
+            yield get_placeholder_movie_details(movie)
+
+def fetch_movie_details_concurrently(movies):
+    """
+    Fetch details for many movies in parallel, preserving input order.
+    """
+    return list(iter_movie_details_concurrently(movies))
 
 def get_streaming_links(movie_title, imdb_id):
     """
     Generate streaming/download links for movies.
     """
-    links = []
-    
-    # Popular streaming platforms
-    streaming_platforms = [
-        {'name': 'Netflix', 'url': f'https://www.netflix.com/search?q={movie_title.replace(" ", "%20")}', 'color': '#E50914'},
-        {'name': 'Amazon Prime', 'url': f'https://www.amazon.com/s?k={movie_title.replace(" ", "+")}+movie', 'color': '#00A8E1'},
-        {'name': 'Disney+', 'url': f'https://www.disneyplus.com/search/{movie_title.replace(" ", "%20")}', 'color': '#113CCF'},
-        {'name': 'Hulu', 'url': f'https://www.hulu.com/search?q={movie_title.replace(" ", "%20")}', 'color': '#1CE783'},
-        {'name': 'YouTube Movies', 'url': f'https://www.youtube.com/results?search_query={movie_title.replace(" ", "+")}+full+movie', 'color': '#FF0000'},
-        {'name': 'IMDb', 'url': f'https://www.imdb.com/title/{imdb_id}/' if imdb_id else f'https://www.imdb.com/find?q={movie_title.replace(" ", "+")}', 'color': '#F5C518'}
-    ]
-    
-    return streaming_platforms
+    return streaming_links.get_links(movie_title, imdb_id)
 
 def render_enhanced_movie_cards(movies):
     """
     Helper function to render enhanced HTML for movie cards with detailed information.
     """
-    movie_cards_html = ''
-    
-    for movie in movies:
-        movie_details = fetch_movie_details(movie)
-        streaming_links = get_streaming_links(movie_details['title'], movie_details['imdbID'])
-        
-        streaming_buttons = ''.join([
-            f'<a href="{link["url"]}" target="_blank" class="streaming-link" style="background-color: {link["color"]}">{link["name"]}</a>'
-            for link in streaming_links
-        ])
-        
-        movie_cards_html += f'''
-        <div class="enhanced-movie-card" data-imdbid="{movie_details['imdbID']}">
-            <div class="movie-poster-container">
-                <img src="{movie_details['poster']}" alt="{movie_details['title']}" class="enhanced-movie-poster">
-                <div class="movie-overlay">
-                    <div class="movie-rating">⭐ {movie_details['rating']}</div>
-                </div>
-                <div class="movie-actions">
-                    <button class="action-btn like-btn" data-movie="{movie_details['title']}" data-imdb="{movie_details['imdbID']}">❤️</button>
-                    <button class="action-btn watchlist-btn" data-movie="{movie_details['title']}" data-imdb="{movie_details['imdbID']}">📋</button>
-                </div>
-            </div>
-            <div class="enhanced-movie-info">
-                <h3 class="enhanced-movie-title">{movie_details['title']}</h3>
-                <p class="movie-year-genre">{movie_details['year']} • {movie_details['genre']}</p>
-                <p class="movie-runtime">⏱️ {movie_details['runtime']}</p>
-                <p class="movie-plot">{movie_details['plot'][:100]}{'...' if len(movie_details['plot']) > 100 else ''}</p>
-                <div class="streaming-links">
-                    {streaming_buttons}
-                </div>
-            </div>
-        </div>
-        '''
-    
-    return movie_cards_html
+    return b''.join(render_movie_card(movie_details) for movie_details in fetch_movie_details_concurrently(movies))
+
+def stream_enhanced_movie_cards(movies):
+    """
+    Yield each movie card as soon as its details resolve, in input order.
+    Cards are followed by CARD_STREAM_DELIMITER so the browser can render complete cards only.
+    """
+    for movie_details in iter_movie_details_concurrently(movies):
+        yield render_movie_card(movie_details) + CARD_STREAM_DELIMITER_BYTES
+
+def movie_cards_response(request, movies):
+    """
+    Return rendered movie cards, streamed card by card when the client asks with ?stream=1.
+    """
+    if request.GET.get('stream') == '1':
+        response = StreamingHttpResponse(stream_enhanced_movie_cards(movies), content_type="text/html")
+        # Keep reverse proxies from buffering the stream
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    return HttpResponse(render_enhanced_movie_cards(movies), content_type="text/html")
+
+def render_movie_card(movie_details):
+    """
+    Render the HTML for a single enhanced movie card as UTF-8 bytes, cached per imdbID.
+    """
+    return card_renderer.get_card(movie_details)
+
+def movie_list_response(request, name):
+    """
+    Serve a configured movie list from its precomputed snapshot, honouring If-None-Match.
+    Falls back to rendering live when no snapshot has been generated yet.
+    """
+    snapshot = snapshots.get_snapshot(name)
+    if snapshot is None:
+        return movie_cards_response(request, snapshots.get_movie_list(name))
+
+    if snapshot['etag'] in parse_etags(request.headers.get('If-None-Match', '')):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(snapshot['html'], content_type="text/html")
+    response['ETag'] = snapshot['etag']
+    # Let browsers keep the snapshot but revalidate it on every load
+    response['Cache-Control'] = 'no-cache'
+    return response
 
 def get_trending_movies(request):
     """
     Fetch trending/popular movies from OMDb API.
     """
     try:
-        # Popular movie titles to fetch
-        popular_movies = [
-            "Avengers: Endgame", "Spider-Man: No Way Home", "Top Gun: Maverick",
-            "Black Panther", "Dune", "The Batman", "Doctor Strange", "Thor: Love and Thunder",
-            "Jurassic World Dominion", "Minions: The Rise of Gru"
-        ]
-        
-        movie_cards_html = render_enhanced_movie_cards(popular_movies)
-        return HttpResponse(movie_cards_html, content_type="text/html")
+        return movie_list_response(request, 'trending')
         
     except Exception as e:
         print(f"Error fetching trending movies: {e}")
@@ -473,15 +651,7 @@ def get_recent_movies(request):
     Fetch recently released movies.
     """
     try:
-        # Recent movie releases
-        recent_movies = [
-            "Oppenheimer", "Barbie", "Fast X", "Indiana Jones 5", "Transformers: Rise of the Beasts",
-            "The Flash", "Guardians of the Galaxy Vol. 3", "John Wick: Chapter 4",
-            "Scream VI", "Creed III"
-        ]
-        
-        movie_cards_html = render_enhanced_movie_cards(recent_movies)
-        return HttpResponse(movie_cards_html, content_type="text/html")
+        return movie_list_response(request, 'recent')
         
     except Exception as e:
         print(f"Error fetching recent movies: {e}")
@@ -492,33 +662,193 @@ def get_movie_details_api(request, imdb_id):
     API endpoint to get detailed movie information.
     """
     try:
-        url = f"http://www.omdbapi.com/?i={imdb_id}&apikey={os.getenv('OMDB_API_KEY')}&plot=full"
-        response = requests.get(url)
-        data = response.json()
-        
+        try:
+            data = fetch_movie_data(imdb_id=imdb_id)
+        except omdb_client.OMDbUnavailable as e:
+            print(f"OMDb unavailable for {imdb_id}: {e}")
+            return JsonResponse({'error': 'Movie details are temporarily unavailable'}, status=503)
+
+        if data is None:
+            return JsonResponse({'error': 'Movie not found'}, status=404)
+
+        return movie_details_api_response(request, imdb_id, data)
+
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+def lookup_cached_movie(title=None, imdb_id=None):
+    """
+    Cached OMDb payload for an imdbID or title, NOT_FOUND for a cached miss, or None.
+    """
+    return movie_cache.lookup_imdb_id(imdb_id) if imdb_id else movie_cache.lookup_title(title)
+
+def fetch_movie_data(title=None, imdb_id=None):
+    """
+    Return the raw OMDb payload for an imdbID or title through the movie cache, or None
+    when OMDb has no match. Raises OMDbUnavailable when OMDb cannot be reached.
+    """
+    data = lookup_cached_movie(title, imdb_id)
+    if data is movie_cache.NOT_FOUND:
+        return None
+
+    if data is None:
+        data = omdb_client.get_movie(title=title, imdb_id=imdb_id)
         if data.get('Response') == 'True':
-            streaming_links = get_streaming_links(data.get('Title', ''), imdb_id)
-            data['streaming_links'] = streaming_links
-            
-            # Track movie view if user is authenticated
-            auth_header = request.headers.get('Authorization')
-            if auth_header:
+            movie_cache.store(data, title=title)
+        elif movie_cache.is_not_found(data):
+            movie_cache.store_not_found(title=title, imdb_id=imdb_id)
+
+    return data if data.get('Response') == 'True' else None
+
+# Bulk movie details endpoint
+@csrf_exempt
+@require_http_methods(["POST"])
+def get_movie_details_bulk(request):
+    """
+    Resolve many imdbIDs/titles concurrently and return them in one payload.
+    Body: {"movies": ["tt0111161", "Dune", ...], "fields": ["Title", "Poster", "imdbRating"]}
+    """
+    try:
+        data = json.loads(request.body)
+        movies = data.get('movies')
+        fields = data.get('fields')
+
+        if not isinstance(movies, list) or not movies:
+            return JsonResponse({'error': 'A non-empty movies list is required'}, status=400)
+        if len(movies) > MAX_BULK_DETAILS:
+            return JsonResponse({'error': f'At most {MAX_BULK_DETAILS} movies per request'}, status=400)
+        if not all(isinstance(movie, str) and movie.strip() for movie in movies):
+            return JsonResponse({'error': 'Each movie must be an imdbID or a title'}, status=400)
+        if fields is not None and not (isinstance(fields, list) and all(isinstance(field, str) for field in fields)):
+            return JsonResponse({'error': 'fields must be a list of field names'}, status=400)
+
+        queries = [movie.strip() for movie in movies]
+        # Duplicates in one request share a single lookup
+        cached = {query: lookup_cached_movie(**movie_query_kwargs(query)) for query in set(queries)}
+        misses = [query for query, movie in cached.items() if movie is None]
+        if misses:
+            # Arbitrary titles always miss the cache, so each miss spends the client's OMDb budget
+            client_id = request.supabase_user.id if request.supabase_user else request.META.get('REMOTE_ADDR')
+            retry_after = bulk_details_limiter.acquire(client_id, cost=len(misses))
+            if retry_after:
+                response = JsonResponse({'error': 'Too many uncached movie lookups, please slow down'}, status=429)
+                response['Retry-After'] = str(max(1, round(retry_after)))
+                return response
+
+        deadline = time.monotonic() + OMDB_FETCH_DEADLINE
+        futures = {query: omdb_executor.submit(contextvars.copy_context().run, fetch_movie_data, **movie_query_kwargs(query))
+                   for query in misses}
+
+        results = []
+        for query in queries:
+            if query not in futures:
+                movie = None if cached[query] is movie_cache.NOT_FOUND else cached[query]
+            else:
                 try:
-                    token = auth_header.replace('Bearer ', '')
-                    user_response = supabase.auth.get_user(token)
-                    if user_response.user:
-                        supabase.table('user_movie_interactions').insert({
-                            'user_id': user_response.user.id,
-                            'movie_title': data.get('Title', ''),
-                            'imdb_id': imdb_id,
-                            'interaction_type': 'viewed'
-                        }).execute()
-                except:
-                    pass  # Continue if tracking fails
-            
-            return JsonResponse(data)
-        else:
-            return JsonResponse({'error': 'Movie not found'}, status=404)
-            
+                    movie = futures[query].result(timeout=max(0, deadline - time.monotonic()))
+                except (FutureTimeoutError, omdb_client.OMDbUnavailable):
+                    results.append({'query': query, 'error': 'Movie details are temporarily unavailable'})
+                    continue
+
+            if movie is None:
+                results.append({'query': query, 'error': 'Movie not found'})
+            else:
+                results.append(select_movie_fields(query, movie, fields))
+
+        return JsonResponse({'movies': results})
+
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
\ No newline at end of file
+        return JsonResponse({'error': str(e)}, status=500)
+
+# Movie search proxy
+@require_http_methods(["GET"])
+def search_movies(request):
+    """
+    Proxy OMDb title searches (?q=...&page=...) through the shared search cache,
+    so browsers never call OMDb or see the API key.
+    """
+    query = movie_search.normalize_query(request.GET.get('q', ''))
+    if len(query) < movie_search.SEARCH_MIN_QUERY_LENGTH:
+        return JsonResponse({'error': 'A search query of at least two characters is required'}, status=400)
+
+    try:
+        page = int(request.GET.get('page', '1'))
+    except ValueError:
+        page = 0
+    if not 1 <= page <= movie_search.SEARCH_MAX_PAGE:
+        return JsonResponse({'error': f'page must be between 1 and {movie_search.SEARCH_MAX_PAGE}'}, status=400)
+
+    client_id = request.supabase_user.id if request.supabase_user else request.META.get('REMOTE_ADDR')
+    try:
+        data = movie_search.search(query, page, client_id)
+    except movie_search.SearchRateLimited as e:
+        response = JsonResponse({'error': 'Too many searches, please slow down'}, status=429)
+        response['Retry-After'] = str(max(1, round(e.retry_after)))
+        return response
+    except omdb_client.OMDbUnavailable as e:
+        print(f"OMDb search unavailable for {query}: {e}")
+        return JsonResponse({'error': 'Search is temporarily unavailable'}, status=503)
+
+    data['page'] = page
+    response = JsonResponse(data)
+    # Identical searches can also be answered by the browser cache for a while
+    response['Cache-Control'] = f'private, max-age={movie_search.SEARCH_BROWSER_MAX_AGE}'
+    return response
+
+# Typeahead over the local movie catalog
+@require_http_methods(["GET"])
+def suggest_movies(request):
+    """
+    Title suggestions for a search prefix (?q=...), answered from the local catalog.
+    """
+    query = request.GET.get('q', '').strip()
+    if len(query) < movie_search.SEARCH_MIN_QUERY_LENGTH:
+        return JsonResponse({'suggestions': []})
+
+    response = JsonResponse({'suggestions': catalog.suggest_titles(query, CATALOG_SUGGESTION_COUNT)})
+    response['Cache-Control'] = f'private, max-age={movie_search.SEARCH_BROWSER_MAX_AGE}'
+    return response
+
+def movie_query_kwargs(query):
+    """
+    Treat strings shaped like an imdbID as one, anything else as a title.
+    """
+    if IMDB_ID_PATTERN.fullmatch(query):
+        return {'imdb_id': query}
+    return {'title': query}
+
+def select_movie_fields(query, data, fields):
+    """
+    Keep only the requested OMDb fields (all of them when fields is None).
+    'streaming_links' may be requested like any other field.
+    """
+    movie = {'query': query, 'imdbID': data.get('imdbID', '')}
+    for field in data if fields is None else fields:
+        if field == 'streaming_links':
+            movie[field] = get_streaming_links(data.get('Title', ''), data.get('imdbID', ''))
+        elif field in data:
+            movie[field] = data[field]
+    return movie
+
+def movie_details_api_response(request, imdb_id, data):
+    """
+    Build the movie details JSON response from an OMDb payload and record the view.
+    """
+    if data.get('Response') == 'True':
+        # Cached payloads are shared, so never mutate them in place
+        data = dict(data)
+        streaming_links = get_streaming_links(data.get('Title', ''), imdb_id)
+        data['streaming_links'] = streaming_links
+
+        # Track movie view if user is authenticated
+        if request.supabase_user:
+            interaction_queue.enqueue({
+                'user_id': request.supabase_user.id,
+                'movie_title': data.get('Title', ''),
+                'imdb_id': imdb_id,
+                'interaction_type': 'viewed'
+            })
+
+        return JsonResponse(data)
+    else:
+        return JsonResponse({'error': 'Movie not found'}, status=404)
\ No newline at end of file
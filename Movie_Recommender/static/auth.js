@@ -2,12 +2,22 @@
 class AuthManager {
     constructor() {
         this.currentUser = null;
+        // Interactions waiting to be sent to the batch tracking endpoint
+        this.pendingInteractions = [];
+        this.flushTimer = null;
         this.init();
     }
 
     init() {
         this.bindEvents();
         this.checkAuthState();
+
+        // Send anything still buffered before the page goes away
+        document.addEventListener('visibilitychange', () => {
+            if (document.visibilityState === 'hidden') {
+                this.flushInteractions();
+            }
+        });
     }
 
     bindEvents() {
@@ -218,20 +228,21 @@ class AuthManager {
         movieResults.innerHTML = '<div class="loading-spinner">Loading your personalized recommendations...</div>';
 
         try {
-            // Fetch detailed movie information for each recommendation
-            const movieCards = await Promise.all(movies.map(async (movie) => {
-                try {
-                    const response = await fetch(`http://www.omdbapi.com/?t=${encodeURIComponent(movie)}&apikey=35dbc24e&plot=full`);
-                    const data = await response.json();
-                    
-                    if (data.Response === 'True') {
-                        return this.createMovieCard(data);
-                    }
-                } catch (error) {
-                    console.error(`Error fetching details for ${movie}:`, error);
-                }
-                return null;
-            }));
+            // Fetch details for all recommendations in one request through the server-side cache
+            const response = await fetch('/api/movies/details/', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({
+                    movies: movies,
+                    fields: ['Title', 'Poster', 'imdbRating', 'Year', 'Genre', 'Runtime', 'Plot']
+                })
+            });
+            const data = await response.json();
+            if (!response.ok) {
+                throw new Error(data.error);
+            }
+
+            const movieCards = data.movies.map(movie => movie.error ? null : this.createMovieCard(movie));
 
             const validCards = movieCards.filter(card => card !== null);
             movieResults.innerHTML = validCards.join('');
@@ -320,27 +331,46 @@ class AuthManager {
         });
     }
 
-    async trackMovieInteraction(movieTitle, imdbId, interactionType) {
+    trackMovieInteraction(movieTitle, imdbId, interactionType) {
         if (!this.currentUser || !supabase) return;
 
+        // Buffer the event; a burst of likes/watchlist clicks is sent as one request
+        this.pendingInteractions.push({
+            movie_title: movieTitle,
+            imdb_id: imdbId,
+            interaction_type: interactionType
+        });
+
+        if (this.pendingInteractions.length >= 20) {
+            this.flushInteractions();
+        } else if (!this.flushTimer) {
+            this.flushTimer = setTimeout(() => this.flushInteractions(), 1000);
+        }
+    }
+
+    async flushInteractions() {
+        clearTimeout(this.flushTimer);
+        this.flushTimer = null;
+
+        const interactions = this.pendingInteractions.filter(interaction => interaction.movie_title);
+        this.pendingInteractions = [];
+        if (!interactions.length || !supabase) return;
+
         try {
             const { data: { session } } = await supabase.auth.getSession();
             if (!session) return;
 
-            await fetch('/api/movies/track/', {
+            await fetch('/api/movies/track/batch/', {
                 method: 'POST',
+                keepalive: true,
                 headers: {
                     'Content-Type': 'application/json',
                     'Authorization': `Bearer ${session.access_token}`
                 },
-                body: JSON.stringify({
-                    movie_title: movieTitle,
-                    imdb_id: imdbId,
-                    interaction_type: interactionType
-                })
+                body: JSON.stringify({ interactions })
             });
         } catch (error) {
-            console.error('Error tracking movie interaction:', error);
+            console.error('Error tracking movie interactions:', error);
         }
     }
 
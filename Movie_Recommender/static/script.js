@@ -1,7 +1,3 @@
-// API key for OMDb API
-const API_KEY = '35dbc24e';
-const BASE_URL = 'https://www.omdbapi.com/';
-
 // Select DOM elements
 const searchBox = document.getElementById('movie-search');
 const searchButton = document.getElementById('search-button');
@@ -67,12 +63,22 @@ function getCSRFToken() {
     return '';
 }
 
+// Search OMDb through the server-side proxy, which caches and rate-limits searches
+async function searchMovies(query, page = 1) {
+    const response = await fetch(`/api/search/?q=${encodeURIComponent(query)}&page=${page}`);
+    const data = await response.json();
+    if (response.status === 429 || response.status >= 500) {
+        throw new Error(data.error);
+    }
+    // Invalid queries come back as an empty result
+    return response.ok ? data : { Response: 'False', Error: data.error };
+}
+
 // Function to fetch movies based on a query
 async function fetchMovies(query) {
     showLoading();
     try {
-        const response = await fetch(`${BASE_URL}?s=${query}&apikey=${API_KEY}`);
-        const data = await response.json();
+        const data = await searchMovies(query);
         hideLoading();
         if (data.Response === "True") {
             displayMovies(data.Search);
@@ -100,9 +106,7 @@ async function fetchMovies(query) {
 async function fetchMoviesByGenre(genre) {
     showLoading();
     try {
-        const query = `${genre} movies`;
-        const response = await fetch(`${BASE_URL}?s=${query}&apikey=${API_KEY}`);
-        const data = await response.json();
+        const data = await searchMovies(`${genre} movies`);
         hideLoading();
         if (data.Response === "True") {
             displayMovies(data.Search);
@@ -126,15 +130,58 @@ async function fetchMoviesByGenre(genre) {
     }
 }
 
+// Marks the end of each card in streamed card responses (see views.CARD_STREAM_DELIMITER)
+const CARD_STREAM_DELIMITER = '<!--card-end-->';
+
+// Render a streamed card response, showing each card as soon as it arrives
+async function renderStreamedCards(response) {
+    if (!response.body || !response.body.getReader) {
+        const htmlContent = await response.text();
+        hideLoading();
+        movieResults.innerHTML = htmlContent.split(CARD_STREAM_DELIMITER).join('');
+        addMovieCardListeners();
+        return;
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let cleared = false;
+
+    while (true) {
+        const { done, value } = await reader.read();
+        buffer += done ? decoder.decode() : decoder.decode(value, { stream: true });
+
+        // Only complete cards are rendered; a partial card stays in the buffer
+        const parts = buffer.split(CARD_STREAM_DELIMITER);
+        buffer = done ? '' : parts.pop();
+
+        for (const part of parts) {
+            if (!part.trim()) continue;
+            if (!cleared) {
+                hideLoading();
+                movieResults.innerHTML = '';
+                cleared = true;
+            }
+            movieResults.insertAdjacentHTML('beforeend', part);
+        }
+
+        if (done) break;
+    }
+
+    if (!cleared) {
+        hideLoading();
+        movieResults.innerHTML = '';
+    }
+    addMovieCardListeners();
+}
+
 // Load trending movies
 async function loadTrendingMovies() {
     showLoading();
     try {
-        const response = await fetch('/trending-movies/');
-        const htmlContent = await response.text();
-        hideLoading();
-        movieResults.innerHTML = htmlContent;
-        addMovieCardListeners();
+        const response = await fetch('/trending-movies/?stream=1');
+        await renderStreamedCards(response);
     } catch (error) {
         hideLoading();
         console.error("Error loading trending movies:", error);
@@ -151,11 +198,8 @@ async function loadTrendingMovies() {
 async function loadRecentMovies() {
     showLoading();
     try {
-        const response = await fetch('/recent-movies/');
-        const htmlContent = await response.text();
-        hideLoading();
-        movieResults.innerHTML = htmlContent;
-        addMovieCardListeners();
+        const response = await fetch('/recent-movies/?stream=1');
+        await renderStreamedCards(response);
     } catch (error) {
         hideLoading();
         console.error("Error loading recent movies:", error);
@@ -285,6 +329,35 @@ if (searchButton) {
     });
 }
 
+// Typeahead from the local catalog, requested once typing pauses
+const SUGGEST_DELAY_MS = 150;
+let suggestTimer = null;
+
+if (searchBox) {
+    const suggestions = document.createElement('datalist');
+    suggestions.id = 'movie-suggestions';
+    searchBox.after(suggestions);
+    searchBox.setAttribute('list', suggestions.id);
+
+    searchBox.addEventListener('input', () => {
+        clearTimeout(suggestTimer);
+        const query = searchBox.value.trim();
+        if (query.length < 2) return;
+
+        suggestTimer = setTimeout(async () => {
+            try {
+                const response = await fetch(`/api/search/suggest/?q=${encodeURIComponent(query)}`);
+                const data = await response.json();
+                suggestions.innerHTML = data.suggestions
+                    .map(movie => `<option value="${movie.Title.replace(/"/g, '&quot;')}">${movie.Year || ''}</option>`)
+                    .join('');
+            } catch (error) {
+                console.error('Error fetching suggestions:', error);
+            }
+        }, SUGGEST_DELAY_MS);
+    });
+}
+
 // Allow Enter key for search
 if (searchBox) {
     searchBox.addEventListener('keypress', (e) => {
@@ -313,18 +386,16 @@ async function fetchMovieRecommendations(mood) {
         formData.append('mood', mood);
         formData.append('csrfmiddlewaretoken', getCSRFToken());
 
-        const response = await fetch('/mood-recommendations/', {
+        const response = await fetch('/mood-recommendations/?stream=1', {
             method: 'POST',
             body: formData,
         });
 
-        const htmlResponse = await response.text();
-        hideLoading();
-
         if (response.ok) {
-            movieResults.innerHTML = htmlResponse;
-            addMovieCardListeners();
+            await renderStreamedCards(response);
         } else {
+            const htmlResponse = await response.text();
+            hideLoading();
             movieResults.innerHTML = `
                 <div style="text-align: center; padding: 40px; color: #ff6b6b;">
                     <h3>Error getting recommendations</h3>
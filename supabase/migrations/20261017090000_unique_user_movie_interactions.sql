@@ -0,0 +1,21 @@
+/*
+  # Idempotent movie interaction tracking
+
+  1. Changes
+    - Remove duplicate `user_movie_interactions` rows, keeping the earliest one
+    - Add a unique index on (`user_id`, `movie_title`, `interaction_type`) so
+      tracking can use a single INSERT ... ON CONFLICT DO NOTHING (upsert)
+      instead of select-then-insert
+*/
+
+-- Remove existing duplicates so the unique index can be built
+DELETE FROM user_movie_interactions a
+  USING user_movie_interactions b
+  WHERE a.user_id = b.user_id
+    AND a.movie_title = b.movie_title
+    AND a.interaction_type = b.interaction_type
+    AND (a.created_at, a.id) > (b.created_at, b.id);
+
+-- One row per user, movie and interaction type
+CREATE UNIQUE INDEX IF NOT EXISTS user_movie_interactions_user_movie_type_key
+  ON user_movie_interactions (user_id, movie_title, interaction_type);